@@ -1,4 +1,5 @@
 import os
+import time
 from functools import cache
 from typing import TYPE_CHECKING, Any
 
@@ -15,6 +16,8 @@ from google.cloud.firestore_v1.async_client import AsyncClient
 from google.cloud.firestore_v1.async_document import AsyncDocumentReference
 from loguru import logger
 
+from ..exceptions import DocumentNotFound
+
 # TODO: refactor. Pass this in as a parameter where required.
 GOOGLE_CLOUD_PROJECT = os.getenv("GOOGLE_CLOUD_PROJECT")
 
@@ -63,10 +66,51 @@ async def get_document(collection_name: str, document_id: str) -> DocumentSnapsh
     d = db.document(docpath)
     doc = await d.get()  # type: DocumentSnapshot
     if not doc.exists:
-        raise ValueError(f"Document '{document_id}' not found.")
+        raise DocumentNotFound(document_id)
     return doc
 
 
+@backoff.on_exception(
+    backoff.expo,
+    exception=(aiohttp.ClientResponseError, ServerError),
+    max_tries=5,
+    jitter=backoff.full_jitter,
+)
+async def get_documents(
+    collection_name: str, document_ids: list[str]
+) -> list[DocumentSnapshot]:
+    """Fetches multiple documents from a collection in a single request.
+
+    Parameters
+    ----------
+    collection_name : `str`
+        The collection the documents are stored in.
+    document_ids : `list[str]`
+        IDs of the documents to fetch.
+
+    Returns
+    -------
+    `list[DocumentSnapshot]`
+        The documents, in the same order as `document_ids`.
+
+    Raises
+    ------
+    `DocumentNotFound`
+        If one or more of the documents do not exist.
+    """
+    db = get_firestore_client()
+    col = db.collection(collection_name)
+    logger.debug(f"Fetching {len(document_ids)} documents from {collection_name}")
+    refs = [col.document(document_id) for document_id in document_ids]
+    # get_all() does not guarantee that documents are returned in the
+    # same order as they were requested in
+    docs = {doc.id: doc async for doc in db.get_all(refs)}
+    missing = [i for i in document_ids if i not in docs or not docs[i].exists]
+    if missing:
+        raise DocumentNotFound(", ".join(missing))
+    return [docs[document_id] for document_id in document_ids]
+
+
 @backoff.on_exception(
     backoff.expo,
     exception=(aiohttp.ClientResponseError, ServerError),
@@ -83,8 +127,19 @@ async def add_document(
     return d
 
 
-async def check_db_exists(collection: str) -> bool:
-    """Checks if the database is available."""
+# Results of recent database checks: collection -> (time of check, result)
+_db_checks = {}  # type: dict[str, tuple[float, bool]]
+
+
+async def check_db_exists(collection: str, max_age: float = 5.0) -> bool:
+    """Checks if the database is available.
+
+    The result is reused for `max_age` seconds, so that frequent health
+    checks don't each make a request to the database.
+    """
+    checked = _db_checks.get(collection)
+    if checked and time.monotonic() - checked[0] < max_age:
+        return checked[1]
     try:
         client = get_firestore_client()
         col = client.collection(collection)
@@ -92,6 +147,8 @@ async def check_db_exists(collection: str) -> bool:
         await query.get()
     except Exception as e:
         logger.warning(f"Could not connect to database: {e}")
-        return False
+        ok = False
     else:
-        return True
+        ok = True
+    _db_checks[collection] = (time.monotonic(), ok)
+    return ok
@@ -1,8 +1,10 @@
 import asyncio
+import io
 import json
 import os
 from pathlib import Path
 from typing import Any, NamedTuple, Optional
+from weakref import WeakKeyDictionary
 
 import aiohttp
 import backoff
@@ -40,8 +42,14 @@ class StorageWithBackoff(Storage):
         max_tries=5,
         jitter=backoff.full_jitter,
     )
-    async def upload(self, *args: Any, **kwargs: Any):
-        return await super().upload(*args, **kwargs)
+    async def upload(
+        self, bucket: str, object_name: str, file_data: Any, **kwargs: Any
+    ):
+        # A file object is consumed by a failed attempt, so we rewind it
+        # before every attempt. File objects are assumed to be at the start.
+        if isinstance(file_data, io.IOBase):
+            file_data.seek(0)
+        return await super().upload(bucket, object_name, file_data, **kwargs)
 
     @backoff.on_exception(
         backoff.expo,
@@ -62,9 +70,48 @@ class StorageWithBackoff(Storage):
         return await super().delete(*args, **kwargs)
 
 
+# Storage clients are shared between requests, so that we don't have to open
+# a new connection pool and re-authenticate for every request.
+# The underlying aiohttp session is bound to the event loop it was created in,
+# hence we keep one set of clients per event loop.
+_clients: WeakKeyDictionary[
+    asyncio.AbstractEventLoop, dict[Optional[str], StorageWithBackoff]
+] = WeakKeyDictionary()
+
+
 def get_storage_client(service_file: Optional[str]) -> StorageWithBackoff:
-    """Returns a Google Cloud Storage client."""
-    return StorageWithBackoff(service_file=service_file)
+    """Returns a shared Google Cloud Storage client for the running event loop.
+
+    The client is created with a shared session, which means closing it
+    (e.g. by using it as a context manager) does not close the session.
+    Use `close_storage_clients()` to close the sessions on shutdown.
+
+    Parameters
+    ----------
+    service_file : `Optional[str]`
+        Path to the service account file to authenticate with.
+
+    Returns
+    -------
+    `StorageWithBackoff`
+        Async Google Cloud Storage client.
+    """
+    clients = _clients.setdefault(asyncio.get_running_loop(), {})
+    client = clients.get(service_file)
+    if client is None:
+        client = StorageWithBackoff(
+            service_file=service_file, session=aiohttp.ClientSession()
+        )
+        clients[service_file] = client
+    return client
+
+
+async def close_storage_clients() -> None:
+    """Closes the sessions of all shared storage clients created in the
+    running event loop."""
+    clients = _clients.pop(asyncio.get_running_loop(), {})
+    for client in clients.values():
+        await client.session.session.close()
 
 
 async def fetch_json_blob(
@@ -82,12 +129,11 @@ async def fetch_json_blob(
         blob = await bucket.get_blob(blob_name)
         content = await blob.download()
 
-    # Decode content as UTF-8
-    b = content.decode("utf-8")  # NOTE: This blocks. Run in executor?
-
+    # json.loads() decodes UTF-8 bytes itself, so we don't have to create
+    # a decoded copy of the (potentially large) content in the event loop
     loop = asyncio.get_event_loop()
     try:
-        json_content = await loop.run_in_executor(None, json.loads, b)
+        json_content = await loop.run_in_executor(None, json.loads, content)
     except Exception as e:
         id = getattr(
             blob, "id", None
@@ -100,6 +146,24 @@ async def fetch_json_blob(
     return StorageObject(blob=blob, content=json_content)
 
 
+async def download_blob(
+    bucket_name: str, blob_name: str, service_file: Optional[str] = None
+) -> bytes:
+    """Downloads the raw content of a blob in the given bucket.
+
+    Unlike `fetch_json_blob`, the blob's metadata is not retrieved,
+    so this only makes a single request.
+    """
+    if not service_file:
+        service_file = os.getenv("GOOGLE_APPLICATION_CREDENTIALS")
+    async with get_storage_client(service_file) as client:
+        return await client.download(bucket_name, blob_name)
+
+
+# Buckets that are known to exist, so we don't have to check before every upload
+_existing_buckets = set()  # type: set[str]
+
+
 # TODO: add backoff?
 async def upload_file_to_bucket(
     path: Path, bucket_name: str, service_file: Optional[str] = None
@@ -117,21 +181,23 @@ async def upload_file_to_bucket(
 
     try:
         async with get_storage_client(service_file) as client:
-
-            try:
-                # Check if bucket exists
-                bucket = client.get_bucket(bucket_name)
-                await bucket.get_metadata()
-            except aiohttp.ClientResponseError as e:
-                if e.code != 404:
-                    raise
-                # Create bucket if it doesn't exist
-                loop = asyncio.get_event_loop()
-                await loop.run_in_executor(None, create_bucket, bucket_name)
-
-            status = await client.upload_from_filename(
-                bucket_name, path.name, str(path)
-            )
+            # Only check if bucket exists the first time we upload to it
+            if bucket_name not in _existing_buckets:
+                try:
+                    bucket = client.get_bucket(bucket_name)
+                    await bucket.get_metadata()
+                except aiohttp.ClientResponseError as e:
+                    if e.code != 404:
+                        raise
+                    # Create bucket if it doesn't exist
+                    loop = asyncio.get_event_loop()
+                    await loop.run_in_executor(None, create_bucket, bucket_name)
+                _existing_buckets.add(bucket_name)
+
+            # Upload the file object instead of its contents, so that the
+            # file is streamed to the bucket instead of being read into memory.
+            with open(path, "rb") as f:
+                status = await client.upload(bucket_name, path.name, f)
             logger.debug(status)
             logger.debug(f"Uploaded file {path} to bucket {bucket_name}")
     # catch errors
@@ -38,13 +38,13 @@ class ReportRequestBase(BaseModel):
 class ReportRequestIn(ReportRequestBase):
     """Request body for POST /reports endpoint in Reporter service"""
 
-    # TODO: ensure no duplicates
     scan_ids: list[str] = Field(..., min_items=1)
 
     @validator("scan_ids")
     def validate_scan_ids(cls, v: list[str]) -> list[str]:
-        # Ensure no duplicates
-        return list(set(v))
+        # Ensure no duplicates, so that the same scan isn't fetched twice.
+        # Unlike a set, this preserves the order of the IDs.
+        return list(dict.fromkeys(v))
 
 
 class FirestoreQuery(NamedTuple):
@@ -0,0 +1,49 @@
+import asyncio
+from itertools import islice
+from typing import AsyncIterator, Awaitable, Iterable, TypeVar
+
+T = TypeVar("T")
+
+
+async def bounded_as_completed(
+    aws: Iterable[Awaitable[T]], limit: int
+) -> AsyncIterator[T]:
+    """Runs awaitables concurrently, with at most `limit` running at once,
+    and yields their results in the order they complete.
+
+    Unlike `asyncio.gather`, awaitables are only scheduled when there is
+    room for them, and results are handed to the caller as soon as they
+    are available, instead of being collected until all are done.
+
+    Parameters
+    ----------
+    aws : `Iterable[Awaitable[T]]`
+        Awaitables to run. Consumed lazily.
+    limit : `int`
+        Maximum number of awaitables to run at once.
+
+    Yields
+    ------
+    `T`
+        Result of each awaitable.
+        If an awaitable raises, the exception is propagated to the caller,
+        and any awaitables still running are cancelled.
+    """
+    if limit < 1:
+        raise ValueError("limit must be at least 1")
+    it = iter(aws)
+    pending = {asyncio.ensure_future(aw) for aw in islice(it, limit)}
+    try:
+        while pending:
+            done, pending = await asyncio.wait(
+                pending, return_when=asyncio.FIRST_COMPLETED
+            )
+            # Top up before yielding, so the caller processing a result
+            # doesn't keep the remaining slots idle.
+            for aw in islice(it, len(done)):
+                pending.add(asyncio.ensure_future(aw))
+            for task in done:
+                yield task.result()
+    finally:
+        for task in pending:
+            task.cancel()
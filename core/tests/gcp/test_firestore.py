@@ -1,9 +1,10 @@
 """Unit tests that require mocking."""
 import json
 import os
-from unittest.mock import Mock, patch
+from unittest.mock import AsyncMock, Mock, patch
 
 import pytest
+from auspex_core.gcp import firestore
 from auspex_core.gcp.firestore import add_document
 from auspex_core.models.scan import ScanLog
 from google.cloud.firestore import DocumentSnapshot
@@ -97,3 +98,17 @@ async def test_add_firestore_document(scan: ScanLog):
     ]:
         assert field in d
         assert await doc.get(field) is not None
+
+
+@pytest.mark.asyncio
+async def test_check_db_exists_cached() -> None:
+    client = Mock()
+    client.collection.return_value.limit.return_value.get = AsyncMock()
+    with patch.object(firestore, "get_firestore_client", return_value=client):
+        with patch.object(firestore, "_db_checks", {}):
+            assert await firestore.check_db_exists("test")
+            assert await firestore.check_db_exists("test")
+            # The second check reuses the result of the first
+            assert client.collection.call_count == 1
+            assert await firestore.check_db_exists("test", max_age=0)
+            assert client.collection.call_count == 2
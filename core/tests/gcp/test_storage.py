@@ -1,9 +1,16 @@
 import json
+from pathlib import Path
 from typing import Any
 from unittest.mock import Mock, patch
 
 import pytest
-from auspex_core.gcp.storage import ObjectStatus, upload_json_blob_from_memory
+from auspex_core.gcp.storage import (
+    ObjectStatus,
+    close_storage_clients,
+    get_storage_client,
+    upload_file_to_bucket,
+    upload_json_blob_from_memory,
+)
 from auspex_core.models.scan import ScanLog
 from gcloud.aio.storage import Storage
 from google.cloud import storage
@@ -46,3 +53,42 @@ async def test_upload_json_blob_from_memory() -> None:
     assert obj is not None
     assert obj.name == filename
     assert obj.bucket == bucket
+
+
+class RecordingStorageClient(MockStorageClient):
+    uploaded = []  # type: list[bytes]
+
+    async def upload(  # type: ignore
+        self, bucket: str, filename: str, contents: Any, **kwargs
+    ) -> dict[str, Any]:
+        self.uploaded.append(contents.read())
+        return await super().upload(bucket, filename, contents, **kwargs)
+
+
+@patch("auspex_core.gcp.storage.StorageWithBackoff", RecordingStorageClient)
+@patch("auspex_core.gcp.storage._existing_buckets", {"test-bucket"})
+@pytest.mark.asyncio
+async def test_upload_file_to_bucket(tmp_path: Path) -> None:
+    path = tmp_path / "report.pdf"
+    path.write_bytes(b"%PDF-1.5")
+    status = await upload_file_to_bucket(path, "test-bucket")
+    assert status.name == "report.pdf"
+    # The file object is passed to the client instead of its contents
+    assert RecordingStorageClient.uploaded == [b"%PDF-1.5"]
+    await close_storage_clients()
+
+
+@pytest.mark.asyncio
+async def test_get_storage_client_shared() -> None:
+    client = get_storage_client(None)
+    assert get_storage_client(None) is client
+
+    # Closing the client should not close the shared session
+    async with client:
+        pass
+    assert not client.session.session.closed
+
+    await close_storage_clients()
+    assert client.session.session.closed
+    assert get_storage_client(None) is not client
+    await close_storage_clients()
@@ -0,0 +1,7 @@
+from auspex_core.models.api.report import ReportRequestIn
+
+
+def test_ReportRequestIn_scan_ids_deduplicated() -> None:
+    r = ReportRequestIn(scan_ids=["c", "a", "c", "b", "a"])
+    # Duplicates are removed, and the original order is kept
+    assert r.scan_ids == ["c", "a", "b"]
@@ -1,7 +1,28 @@
+import asyncio
 from datetime import datetime
 
+import pytest
+from auspex_core.utils.concurrency import bounded_as_completed
 from auspex_core.utils.time import timestamp_ms_to_datetime
 
 
 def test_timestamp_ms_to_datetime():
     assert timestamp_ms_to_datetime("1588888888000") == datetime(2020, 5, 8, 0, 1, 28)
+
+
+@pytest.mark.asyncio
+async def test_bounded_as_completed() -> None:
+    running = 0
+    peak = 0
+
+    async def job(i: int) -> int:
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.001 * (i % 3))
+        running -= 1
+        return i
+
+    results = [r async for r in bounded_as_completed((job(i) for i in range(20)), 4)]
+    assert sorted(results) == list(range(20))
+    assert peak == 4
@@ -1,4 +1,3 @@
-import io
 import pickle
 import random
 from datetime import datetime, timedelta
@@ -11,13 +10,12 @@ from auspex_core.models.api.report import ReportRequestIn
 from auspex_core.models.cve import CVSS
 from auspex_core.models.scan import CVSSv3Distribution, ReportData
 from fastapi.exceptions import HTTPException
-from fastapi.responses import StreamingResponse
+from fastapi.responses import FileResponse
 
 from reporter.utils.firestore import get_firestore_document
 
 from .backends.aggregate import AggregateReport
 from .backends.snyk.model import SnykContainerScan
-from .config import AppConfig
 from .db import get_prev_scans
 from .frontends.latex import create_document
 from .types.protocols import ScanType
@@ -27,17 +25,16 @@ mockrouter = fastapi.APIRouter()
 
 
 @mockrouter.post("/reportmock")
-async def generate_report_mock(r: ReportRequestIn) -> StreamingResponse:
+async def generate_report_mock(r: ReportRequestIn) -> FileResponse:
     scan = await get_mock_report(r.scan_ids[0])
     prev_scans = get_mock_reportdata(scan.image, n=100)
 
     outdoc = await create_document(scan, prev_scans)
-    if not outdoc.path.exists():
-        raise HTTPException(500, "Failed to generate report.")
 
-    # Send report file back as a streaming response
-    with open(outdoc.path, "rb") as f:
-        return StreamingResponse(io.BytesIO(f.read()), media_type="application/pdf")
+    # Send report file back without reading it into memory first
+    return FileResponse(
+        outdoc.path, media_type="application/pdf", filename=outdoc.path.name
+    )
 
 
 @mockrouter.post("/aggregatemock")
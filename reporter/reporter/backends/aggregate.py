@@ -1,17 +1,18 @@
+import heapq
 import itertools
 import time
 from collections import Counter
 from dataclasses import dataclass, field
 from datetime import datetime
-from functools import _lru_cache_wrapper, cache, cached_property
+from functools import _lru_cache_wrapper, cached_property
 from itertools import chain
+from operator import attrgetter
 from typing import Iterable, Iterator, Optional, TypeVar
 
 import numpy as np
 from auspex_core.docker.models import ImageInfo, ImageTimeMode
 from auspex_core.models.cve import CVSS, CVESeverity
 from loguru import logger
-from more_itertools import ilen
 from pydantic import BaseModel, Field, validator
 
 from ..frontends.shared.models import VulnAgePoint
@@ -21,6 +22,9 @@ from ..types.protocols import ScanType, VulnerabilityType
 # from .snyk.model import SnykContainerScan, SnykVulnerability
 from ..utils import npmath
 
+# Sort key for vulnerabilities by CVSS score
+_cvss_score = attrgetter("cvssScore")
+
 
 # TODO: move this out the snyk module
 @dataclass
@@ -98,13 +102,10 @@ class AggregateReport:
     @property
     def cvss_max(self) -> float:
         return max(self.cvss_scores(), default=0.0)
-        # return 0.0
 
     @property
     def cvss_min(self) -> float:
-        # return min((scan.cvss_min for scan in self.reports), default=0.0)
         return min(self.cvss_scores(), default=0.0)
-        # return 0.0
 
     @property
     def cvss_median(self) -> float:
@@ -120,12 +121,16 @@ class AggregateReport:
 
     @property
     def cvss(self) -> CVSS:
+        """CVSS metrics of all vulnerabilities."""
+        # Collect the scores of all reports once, instead of once per metric.
+        # Never empty, see `cvss_scores()`.
+        scores = np.array(self.cvss_scores(), dtype=np.float64)
         return CVSS(
-            mean=self.cvss_mean,
-            median=self.cvss_median,
-            stdev=self.cvss_stdev,
-            max=self.cvss_max,
-            min=self.cvss_min,
+            mean=npmath.mean(scores),
+            median=npmath.median(scores),
+            stdev=npmath.stdev(scores),
+            max=float(scores.max()),
+            min=float(scores.min()),
         )
 
     @property
@@ -146,22 +151,21 @@ class AggregateReport:
 
     @property
     def n_low(self) -> int:
-        return ilen(self.low)
+        return self.get_distribution_by_severity()["low"]
 
     @property
     def n_medium(self) -> int:
-        return ilen(self.medium)
+        return self.get_distribution_by_severity()["medium"]
 
     @property
     def n_high(self) -> int:
-        return ilen(self.high)
+        return self.get_distribution_by_severity()["high"]
 
     @property
     def n_critical(self) -> int:
         """Number of critical vulnerabilities."""
-        return ilen(self.critical)
+        return self.get_distribution_by_severity()["critical"]
 
-    @cache
     def cvss_scores(self, ignore_zero: bool = True) -> list[float]:
         scores: list[float] = []
         for scan in self.reports:
@@ -191,12 +195,13 @@ class AggregateReport:
         {'low': 88, 'medium': 659, 'high': 457, 'critical': 171}
         ```
         """
-        return {
-            "low": self.n_low,
-            "medium": self.n_medium,
-            "high": self.n_high,
-            "critical": self.n_critical,
-        }
+        # Sum the distributions of each report instead of
+        # traversing all vulnerabilities once per severity.
+        dist = {"low": 0, "medium": 0, "high": 0, "critical": 0}
+        for report in self.reports:
+            for severity, n in report.get_distribution_by_severity().items():
+                dist[severity] += n
+        return dist
 
     def get_vulnerabilities_by_severity(
         self, severity: CVESeverity
@@ -231,9 +236,7 @@ class AggregateReport:
         return max(
             self.most_severe_n(),
             default=None,
-            # mypy doesn't understand that None takes presedence over key (?)
-            # hence the guard against None here
-            key=lambda v: v.cvssScore if v is not None else 0.0,
+            key=_cvss_score,
         )
 
     def most_severe_n(
@@ -251,13 +254,13 @@ class AggregateReport:
         list[SnykVulnerability]
             List of vulnerabilities
         """
-        vulns = list(self.vulnerabilities)
-        vulns.sort(key=lambda v: v.cvssScore, reverse=True)
+        vulns = self.vulnerabilities
         if upgradable:
-            vulns = list(filter(lambda v: v.is_upgradable, vulns))
-        if n and len(vulns) > n:
-            return vulns[:n]
-        return vulns
+            vulns = filter(attrgetter("is_upgradable"), vulns)
+        if n:
+            # Partial sort when we only need the top N
+            return heapq.nlargest(n, vulns, key=_cvss_score)
+        return sorted(vulns, key=_cvss_score, reverse=True)
 
     # BACKLOG: add n argument so we can get multiple per image?
     def most_severe_per_scan(self) -> dict[str, Optional[VulnerabilityType]]:
@@ -302,9 +305,9 @@ class AggregateReport:
     def most_common_cve(self, n: Optional[int] = 5) -> list[tuple[str, int]]:
         c: Counter[str] = Counter()
         for report in self.reports:
-            # we need to retrieve all CVEs, so we don't pass the n arg here
-            mc = report.most_common_cve()
-            c.update(mc)
+            # we need the counts of all CVEs, so we pass n=None here
+            c.update(dict(report.most_common_cve(None)))
+        # Counter.most_common uses a heap to select the top n
         return c.most_common(n)  # only here do we use n
 
     def get_vulns_age_score_color(self) -> list[VulnAgePoint]:
@@ -312,4 +315,4 @@ class AggregateReport:
         l = []  # type: list[VulnAgePoint]
         for report in self.reports:
             l.extend(report.get_vulns_age_score_color())
-        return sorted(l, key=lambda v: v.timestamp)
+        return sorted(l, key=attrgetter("timestamp"))
@@ -1,10 +1,12 @@
 # TODO: Rewrite methods that return lists as generators in order to optimize memory usage.
 
+import heapq
 import json
 import time
 from collections import Counter
 from datetime import datetime, timezone
-from functools import _lru_cache_wrapper, cache, cached_property
+from functools import _lru_cache_wrapper, cached_property
+from operator import attrgetter
 from os import PathLike
 from typing import Any, Iterable, Iterator, Optional, Sequence, Union
 
@@ -29,6 +31,9 @@ from ...types.protocols import VulnerabilityType
 from ...utils import npmath
 from ...utils.matplotlib import get_cvss_color
 
+# Sort key for vulnerabilities by CVSS score
+_cvss_score = attrgetter("cvssScore")
+
 
 # JSON: .vulnerabilities[n].identifiers
 class Identifiers(BaseModel):
@@ -370,7 +375,9 @@ class SnykContainerScan(BaseModel):
             ts = self.image.get_timestamp(mode)
         else:
             ts = self.timestamp
-        ts = ts.replace(tzinfo=timezone.utc)
+        # Naive timestamps are UTC. Others keep their offset.
+        if not ts.tzinfo:
+            ts = ts.replace(tzinfo=timezone.utc)
         return ts
 
     @property
@@ -412,10 +419,13 @@ class SnykContainerScan(BaseModel):
 
     @property
     def cvss(self) -> CVSS:
+        """CVSS metrics of all vulnerabilities."""
+        # Collect the scores once, instead of once per metric
+        scores = np.array(self.cvss_scores(), dtype=np.float64)
         return CVSS(
-            mean=self.cvss_mean,
-            median=self.cvss_median,
-            stdev=self.cvss_stdev,
+            mean=npmath.mean(scores),
+            median=npmath.median(scores),
+            stdev=npmath.stdev(scores),
             min=self.cvss_min,
             max=self.cvss_max,
         )
@@ -426,9 +436,7 @@ class SnykContainerScan(BaseModel):
         return max(
             self.vulnerabilities,
             default=None,
-            # mypy doesn't understand that None takes presedence over key (?)
-            # hence the guard against None here
-            key=lambda v: v.cvssScore if v is not None else 0.0,
+            key=_cvss_score,
         )
 
     def most_severe_n(
@@ -448,20 +456,13 @@ class SnykContainerScan(BaseModel):
         `list[SnykVulnerability]`
             The `n` most severe vulnerabilities (if any), optionally only upgradable ones.
         """
-        # TODO: optimize memory usage by utilizing generators better
-        # We can limit a generator by doing takewhile(lambda x: x < n, v)
-        #
-        # Then again, what's the point?
-        # We need to collect all to sort anyway... We don't actually save any memory.
-        #
-        # Actually trying to save memory here would require a pretty complex
-        # function to do the filtering.
-        v = sorted(self.vulnerabilities, key=lambda v: v.cvssScore, reverse=True)
+        vulns = self.vulnerabilities  # type: Iterable[SnykVulnerability]
         if upgradable:
-            v = list(filter(lambda v: v.isUpgradable, v))
-        if n and len(v) > n:
-            return v[:n]
-        return v
+            vulns = filter(attrgetter("isUpgradable"), vulns)
+        if n:
+            # Partial sort when we only need the top N
+            return heapq.nlargest(n, vulns, key=_cvss_score)
+        return sorted(vulns, key=_cvss_score, reverse=True)
 
     # def most_severe_of_severity(self, severity: Severity) -> Optional[SnykVulnerability]:
 
@@ -471,7 +472,7 @@ class SnykContainerScan(BaseModel):
         return min(
             self.vulnerabilities,
             default=None,
-            key=lambda v: v.cvssScore if v is not None else 0.0,
+            key=_cvss_score,
         )
 
     @property
@@ -663,9 +664,8 @@ class SnykContainerScan(BaseModel):
     ) -> list[VulnAgePoint]:
         """Returns a list of `VulnAgePoint` objects for all vulnerabilities."""
         l = [vuln.get_age_score_color() for vuln in self.vulnerabilities]
-        return sorted(l, key=lambda v: v.timestamp)
+        return sorted(l, key=attrgetter("timestamp"))
 
-    @cache
     def cvss_scores(self, ignore_zero: bool = True) -> list[float]:
         """Retrieves an NDArray of all vulnerability scores."""
         # TODO: rewrite without list comp to avoid extra allocation
@@ -712,12 +712,13 @@ class SnykContainerScan(BaseModel):
         {'low': 88, 'medium': 659, 'high': 457, 'critical': 171}
         ```
         """
-        return {
-            "low": self.n_low,
-            "medium": self.n_medium,
-            "high": self.n_high,
-            "critical": self.n_critical,
-        }
+        # Count all severities in a single pass over the vulnerabilities,
+        # instead of one pass per severity.
+        dist = {"low": 0, "medium": 0, "high": 0, "critical": 0}
+        for v in self.vulnerabilities:
+            if v.severity in dist:
+                dist[v.severity] += 1
+        return dist
 
     def get_distribution_by_severity_and_upgradability(
         self,
@@ -743,13 +744,28 @@ class SnykContainerScan(BaseModel):
         }
         ```
         """
+        groups = self._group_by_severity()
         return {
-            "low": self.low_by_upgradability,
-            "medium": self.medium_by_upgradability,
-            "high": self.high_by_upgradability,
-            "critical": self.critical_by_upgradability,
+            severity: self._get_vuln_upgradability_distribution(vulns)
+            for severity, vulns in groups.items()
         }
 
+    def _group_by_severity(self) -> dict[str, list[SnykVulnerability]]:
+        """Groups vulnerabilities by their CVSS severity level in a single
+        pass over the vulnerabilities.
+
+        Not cached, as the vulnerabilities of a scan can be modified."""
+        groups = {
+            "low": [],
+            "medium": [],
+            "high": [],
+            "critical": [],
+        }  # type: dict[str, list[SnykVulnerability]]
+        for v in self.vulnerabilities:
+            if v.severity in groups:
+                groups[v.severity].append(v)
+        return groups
+
     def most_common_cve(self, max_n: Optional[int] = 5) -> list[tuple[str, int]]:
         # TODO: most common per severity
         return self._get_cve_counter().most_common(n=max_n)
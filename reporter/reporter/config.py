@@ -1,3 +1,5 @@
+from functools import cache
+
 from pydantic import BaseSettings, Field
 
 
@@ -6,4 +8,18 @@ class AppConfig(BaseSettings):
     collection_reports: str = Field(..., env="COLLECTION_REPORTS")
     url_scanner: str = Field(..., env="URL_SCANNER")
     trend_weeks: int = Field(26, env="REPORTER_TREND_WEEKS")
+    max_concurrency: int = Field(10, env="REPORTER_MAX_CONCURRENCY")
+    # Seconds reports and scan logs of a scan are reused for. 0 disables reuse.
+    cache_ttl: int = Field(60, env="REPORTER_CACHE_TTL")
+    # Maximum total size of scans cached in memory, in megabytes.
+    blob_cache_mb: int = Field(128, env="REPORTER_BLOB_CACHE_MB")
     debug: bool = Field(False, env="DEBUG")
+
+
+@cache
+def get_config() -> AppConfig:
+    """Returns the application config.
+
+    The config is only parsed from the environment on the first call.
+    Subsequent calls return the cached config."""
+    return AppConfig()
@@ -1,14 +1,18 @@
-from datetime import datetime, timedelta
-from typing import Any, AsyncGenerator, Optional, Union, cast
+import asyncio
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from itertools import chain
+from typing import Any, AsyncGenerator, Optional, Sequence, Union, cast
 
 from auspex_core.gcp.firestore import get_firestore_client
 from auspex_core.models.api.report import CVSSField, Direction, OrderOption, ReportQuery
 from auspex_core.models.cve import SEVERITIES
-from auspex_core.models.scan import ParsedVulnerabilities, ReportData
-from google.api_core.exceptions import InvalidArgument
+from auspex_core.models.scan import ParsedVulnerabilities, ReportData, ScanLog
+from google.api_core.exceptions import FailedPrecondition, InvalidArgument
 from google.cloud import firestore
 from google.cloud.firestore import SERVER_TIMESTAMP, async_transactional
 from google.cloud.firestore_v1 import DocumentSnapshot
+from google.cloud.firestore_v1.async_batch import AsyncWriteBatch
 from google.cloud.firestore_v1.async_client import AsyncClient
 from google.cloud.firestore_v1.async_collection import AsyncCollectionReference
 from google.cloud.firestore_v1.async_document import AsyncDocumentReference
@@ -20,7 +24,7 @@ from google.cloud.firestore_v1.types.write import WriteResult
 from loguru import logger
 from pydantic import ValidationError
 
-from .config import AppConfig
+from .config import get_config
 from .types.protocols import ScanType
 from .utils.types import get_reportdata
 
@@ -54,40 +58,190 @@ async def log_report(
     `ReportData`
         The representation of the logged report in the database.
     """
+    report_data = get_reportdata(scan, report_url)
+    await _log_and_mark_historical(scan, report_data)
+    _cache_recent_report(report_data)
+    return report_data
+
+
+# Strong references to pending background tasks, so that they are not
+# garbage collected before they are done.
+_background_tasks = set()  # type: set[asyncio.Task[None]]
+
+# Reports waiting to be logged by the background writer task
+_pending_logs = []  # type: list[tuple[ScanType, ReportData]]
+_writer = None  # type: Optional[asyncio.Task[None]]
+
+
+def log_report_in_background(
+    scan: ScanType,
+    report_url: Optional[str] = None,
+    aggregate: bool = False,
+) -> ReportData:
+    """Like `log_report`, but stores the report in the database in a
+    background task instead of waiting for the database writes to complete.
+
+    Reports logged while the background task is writing are written together
+    in as few batched writes as possible once it is done.
+
+    Errors are logged, but not propagated to the caller.
+    Use `wait_for_background_tasks` to wait for pending tasks to finish.
+
+    Parameters
+    ----------
+    scan : `ScanType`
+        Scan results to log.
+    report_url : `Optional[str]`
+        URL of the human-readable version of the report.
+    aggregate : `bool`
+        Whether or not the report is an aggregate report.
+
+    Returns
+    -------
+    `ReportData`
+        The representation of the report in the database.
+    """
+    global _writer
+    report_data = get_reportdata(scan, report_url)
+    _pending_logs.append((scan, report_data))
+    if _writer is None or _writer.done():
+        _writer = asyncio.create_task(_write_pending_logs())
+        _background_tasks.add(_writer)
+        _writer.add_done_callback(_on_log_report_done)
+    return report_data
+
+
+async def _write_pending_logs() -> None:
+    client = get_firestore_client()
+    collection = get_config().collection_reports
+    # Reports logged while a group is being written are written in the next group
+    while _pending_logs:
+        reports = _pending_logs.copy()
+        _pending_logs.clear()
+        try:
+            await _log_reports(client, collection, reports)
+            # Only reuse reports that have actually been stored
+            for _, report_data in reports:
+                _cache_recent_report(report_data)
+            await asyncio.gather(
+                *(
+                    mark_reports_historical(client, collection, scan)
+                    for scan, _ in reports
+                )
+            )
+        except Exception as e:
+            logger.opt(exception=e).error("Failed to log reports")
+
+
+def _on_log_report_done(task: "asyncio.Task[None]") -> None:
+    _background_tasks.discard(task)
+    if not task.cancelled() and (exc := task.exception()):
+        logger.opt(exception=exc).error("Failed to log report")
+
+
+async def wait_for_background_tasks() -> None:
+    """Waits for all reports being logged in the background to be stored."""
+    if _background_tasks:
+        await asyncio.gather(*_background_tasks, return_exceptions=True)
+
+
+async def _log_and_mark_historical(scan: ScanType, report_data: ReportData) -> None:
     client = get_firestore_client()
 
     # TODO: perform the two steps below as transaction
     # transaction = client.transaction()
     # How to write then read (then write) in a transaction?
 
-    report_data = await _log_report(
-        client, AppConfig().collection_reports, scan, report_url, aggregate
-    )
-    await mark_reports_historical(client, AppConfig().collection_reports, scan)
-    return report_data
+    await _log_report(client, get_config().collection_reports, scan, report_data)
+    await mark_reports_historical(client, get_config().collection_reports, scan)
 
 
 async def _log_report(
     client: AsyncClient,
     collection: str,
     scan: ScanType,
-    report_url: Optional[str],
-    aggregate: bool,
+    r: ReportData,
 ) -> ReportData:
     """Store results of parsed container scan in the database."""
-    r = get_reportdata(scan, report_url)
-
     doc = client.collection(collection).document()
 
     # TODO: Delete or update existing documents with the same image digest
     # TODO: handle exceptions
-    # TODO: perform this as a transaction
 
-    # Create document
-    result = await doc.create(r.dict())
+    # Create the document and its vulnerability subcollection in a single
+    # batched write (one round-trip instead of one per document).
+    batch = client.batch()
+    _add_report_to_batch(batch, doc, scan, r)
+    try:
+        result = await batch.commit()
+    except InvalidArgument:
+        # One or more of the documents (or the batch as a whole) is too large.
+        # Batched writes are atomic, so nothing has been written yet.
+        # Fall back on writing the documents one by one.
+        logger.warning(
+            f"Unable to log report with ID '{scan.id}' in a single batch. "
+            "Logging documents individually."
+        )
+        result = await doc.create(r.dict())
+        await _log_vulnerabilities(doc.collection("vulnerabilities"), scan)
+    logger.debug(f"Logged report with ID '{scan.id}', result: {result}")
+    return r
+
 
-    # Create subcollections for vulnerabilities
+# Number of writes needed to log a single report (see `_add_report_to_batch`)
+REPORT_WRITES = 1 + len(SEVERITIES)
+
+
+async def _log_reports(
+    client: AsyncClient,
+    collection: str,
+    reports: list[tuple[ScanType, ReportData]],
+) -> None:
+    """Store results of multiple parsed container scans in the database,
+    using as few batched writes as possible."""
+    col = client.collection(collection)
+    step = MAX_BATCH_SIZE // REPORT_WRITES
+    for i in range(0, len(reports), step):
+        group = reports[i : i + step]
+        batch = client.batch()
+        for scan, r in group:
+            _add_report_to_batch(batch, col.document(), scan, r)
+        try:
+            await batch.commit()
+        except InvalidArgument:
+            # The batch is too large. Nothing has been written yet,
+            # so we can safely fall back on logging the reports one by one.
+            logger.warning(
+                f"Unable to log {len(group)} reports in a single batch. "
+                "Logging reports individually."
+            )
+            for scan, r in group:
+                await _log_report(client, collection, scan, r)
+        else:
+            logger.debug(f"Logged reports with IDs {[r.id for _, r in group]}")
+
+
+def _add_report_to_batch(
+    batch: AsyncWriteBatch,
+    doc: AsyncDocumentReference,
+    scan: ScanType,
+    r: ReportData,
+) -> None:
+    """Adds the writes that create a report document and its vulnerability
+    subcollection to a batch."""
+    batch.create(doc, r.dict())
     col = doc.collection("vulnerabilities")  # type: CollectionReference
+    for severity in SEVERITIES:
+        data = ParsedVulnerabilities(
+            vulnerabilities=getattr(scan, severity),
+            ok=True,
+        )
+        batch.set(col.document(severity), data.dict())
+
+
+async def _log_vulnerabilities(col: AsyncCollectionReference, scan: ScanType) -> None:
+    """Store the vulnerabilities of a scan in a subcollection, one document
+    per severity. Vulnerabilities that are too large to be stored are left out."""
     for severity in SEVERITIES:
         try:
             data = ParsedVulnerabilities(
@@ -117,26 +271,68 @@ async def _log_report(
                 await col.document(severity).set(data.dict())
             else:
                 raise
-    logger.debug(f"Logged report with ID '{scan.id}', result: {result}")
-    return r
+
+
+# Fields of previous reports retrieved by `get_prev_scans()`.
+# The remaining fields of `ReportData` have default values.
+PREV_SCAN_FIELDS = [
+    "id",
+    "image",
+    "timestamp",
+    "cvss",
+    "vulnerabilities",
+    "report_url",
+    "aggregate",
+    "historical",
+]
+
+
+def _get_prev_scans_query(collection: str, aggregate: bool) -> AsyncQuery:
+    """Returns the part of the query used by `get_prev_scans()` that
+    is the same for every scan.
+
+    The query is cheap to construct, and is not cached, since it is bound to
+    the Firestore client, and thereby the event loop the client is used in.
+
+    Parameters
+    ----------
+    collection : `str`
+        The firestore collection to search for reports in.
+    aggregate : `bool`
+        If true, only matches reports marked 'aggregate'.
+
+    Returns
+    -------
+    `AsyncQuery`
+        Query that can be further filtered by image.
+    """
+    # Only fetch the fields needed to plot trends, so that previous reports
+    # take up as little bandwidth and memory as possible.
+    query = get_firestore_client().collection(collection).select(PREV_SCAN_FIELDS)
+    if aggregate:
+        return query.where("aggregate", "==", True)
+    return query
 
 
 async def get_prev_scans(
-    scan: ScanType,
+    scan: Union[ScanType, ScanLog],
     collection: str,
     max_age: Union[timedelta, datetime],
     ignore_self: bool = True,
     by_image: bool = True,
     aggregate: bool = False,
     skip_historical: bool = True,
+    limit: Optional[int] = None,
 ) -> list[ReportData]:
     """Given a single image scan, find all previous scans going back
     to a certain date.
 
     Parameters
     ----------
-    scan : `ScanType`
+    scan : `Union[ScanType, ScanLog]`
         The scan whose image to find previous reports of.
+        Only its ID and image are used, so the scan log can be used
+        before the scan itself has been parsed.
     collection : `str`
         The firestore collection to search for reports in.
     max_age : `Union[timedelta, datetime]`
@@ -150,72 +346,323 @@ async def get_prev_scans(
         If true, only returns reports marked 'aggregate', by default False
     skip_historical : `bool`, optional
         If true, skips historical reports, by default True
+    limit : `Optional[int]`, optional
+        If set, only the `limit` newest reports are returned, by default None
 
     Returns
     -------
     `list[ReportData]`
         List of previous scan reports.
     """
+    query = _get_prev_scans_query(collection, aggregate)
+    if not aggregate:
+        query = query.where("image.image", "==", scan.image.image)
+
+    # NOTE: This does not apply for aggregate reports.
+    # Report are only marked historical when a newer report of the _SAME_
+    # image is created. Aggregate reports do not work under the same principle,
+    # since we don't factor in which images are in the aggregate, and thus
+    # every aggregate report is considered to be the same image.
+    reports = await _get_prev_reports(
+        query,
+        _get_cutoff(max_age),
+        by_image=by_image,
+        skip_historical=skip_historical and not aggregate,
+        # Make room for the scan itself, as it's filtered out afterwards
+        limit=limit + 1 if limit and ignore_self else limit,
+    )
+
+    # Ignore self when searching for previous scans
+    if ignore_self:
+        reports = [r for r in reports if r.id != scan.id]
+    if limit:
+        del reports[limit:]
+    # TODO: assert no duplicate ids?
+    return reports
+
+
+# Maximum number of values in a Firestore "in" query
+MAX_IN_VALUES = 10
+
+
+async def get_prev_scans_bulk(
+    scans: Sequence[Union[ScanType, ScanLog]],
+    collection: str,
+    max_age: Union[timedelta, datetime],
+    ignore_self: bool = True,
+    by_image: bool = True,
+    skip_historical: bool = True,
+) -> dict[str, list[ReportData]]:
+    """Finds the previous scans of multiple scans at once.
+
+    Equivalent to calling `get_prev_scans()` for each scan, but reports
+    are fetched with one query per `MAX_IN_VALUES` distinct images,
+    instead of one query per scan.
+    Does not support aggregate reports.
+
+    Parameters
+    ----------
+    scans : `Sequence[Union[ScanType, ScanLog]]`
+        The scans whose images to find previous reports of.
+    collection : `str`
+        The firestore collection to search for reports in.
+    max_age : `Union[timedelta, datetime]`
+        Maximum age of report to retrieve.
+        Can be an absolute point in time (datetime) or a maximum age (timedelta).
+    ignore_self : `bool`, optional
+        If true, does not include a scan in its own list, by default True
+    by_image : `bool`, optional
+        If true, returns reports by image creation date instead of scan date, by default True
+    skip_historical : `bool`, optional
+        If true, skips historical reports, by default True
+
+    Returns
+    -------
+    `dict[str, list[ReportData]]`
+        Lists of previous scan reports, keyed by the ID of the scan they belong to.
+    """
+    cutoff = _get_cutoff(max_age)
+    images = list(dict.fromkeys(scan.image.image for scan in scans))
+    query = _get_prev_scans_query(collection, False)
+    results = await asyncio.gather(
+        *(
+            _get_prev_reports(
+                query.where("image.image", "in", images[i : i + MAX_IN_VALUES]),
+                cutoff,
+                by_image=by_image,
+                skip_historical=skip_historical,
+            )
+            for i in range(0, len(images), MAX_IN_VALUES)
+        )
+    )
+
+    reports_by_image = defaultdict(list)  # type: defaultdict[str, list[ReportData]]
+    for report in chain.from_iterable(results):
+        reports_by_image[report.image.image].append(report)
+
+    return {
+        scan.id: [
+            r
+            for r in reports_by_image[scan.image.image]
+            if not (ignore_self and r.id == scan.id)
+        ]
+        for scan in scans
+    }
+
+
+def _get_cutoff(max_age: Union[timedelta, datetime]) -> datetime:
+    """Returns the cutoff as a timezone-aware datetime, so that it can be
+    compared directly with the timestamps Firestore returns.
+    Naive datetimes are assumed to be UTC."""
     if isinstance(max_age, timedelta):
-        cutoff = datetime.now() - max_age
-    else:
-        cutoff = max_age
+        return datetime.now(timezone.utc) - max_age
+    if max_age.tzinfo is None:
+        return max_age.replace(tzinfo=timezone.utc)
+    return max_age
+
+
+async def _get_prev_reports(
+    query: AsyncQuery,
+    cutoff: datetime,
+    by_image: bool,
+    skip_historical: bool,
+    limit: Optional[int] = None,
+) -> list[ReportData]:
+    """Streams the results of a query for previous reports, and returns
+    the reports newer than the cutoff.
 
-    client = get_firestore_client()
-    col = client.collection(collection)
+    Parameters
+    ----------
+    query : `AsyncQuery`
+        Query for previous reports.
+    cutoff : `datetime`
+        Reports older than this are skipped. Must be timezone-aware,
+        see `_get_cutoff()`.
+    by_image : `bool`
+        If true, compares the image creation date instead of scan date to the cutoff.
+    skip_historical : `bool`
+        If true, skips historical reports.
+    limit : `Optional[int]`, optional
+        If set, only the `limit` newest reports are returned, by default None
 
-    query: AsyncQuery
-    if aggregate:
-        query = col.where("aggregate", "==", True)
-    else:
-        query = col.where("image.image", "==", scan.image.image)
+    Returns
+    -------
+    `list[ReportData]`
+        List of previous reports.
+    """
+    # Filter by date server-side if the composite index for the query
+    # exists (see setup/firestore.py). Otherwise, the date is only filtered
+    # client-side, which requires more database reads and memory.
+    field = "image.created" if by_image else "timestamp"
+    query_composite = cast(AsyncQuery, query.where(field, ">", cutoff))
+    if limit:
+        # Newest first, so we can stop reading once we have enough reports
+        query_composite = cast(
+            AsyncQuery,
+            query_composite.order_by(field, direction=firestore.Query.DESCENDING),
+        )
 
-    # Perform filtering by date client-side instead of using composite query
-    # This will require more database reads and memory, but saves us from
-    # having to create a composite index
     reports = []  # type: list[ReportData]
+    try:
+        async for doc in query_composite.stream():
+            if r := _parse_prev_report(doc, cutoff, by_image, skip_historical):
+                reports.append(r)
+                if limit and len(reports) >= limit:
+                    break
+        return reports
+    except FailedPrecondition:
+        if reports:
+            raise
+    logger.debug("Composite index missing. Falling back to single key index.")
+
     async for doc in query.stream():
+        if r := _parse_prev_report(doc, cutoff, by_image, skip_historical):
+            reports.append(r)
+    if limit:
+        key = (lambda r: r.image.created) if by_image else (lambda r: r.timestamp)
+        reports.sort(key=key, reverse=True)
+        del reports[limit:]
+    return reports
+
+
+def _parse_prev_report(
+    doc: DocumentSnapshot, cutoff: datetime, by_image: bool, skip_historical: bool
+) -> Optional[ReportData]:
+    """Parses a previous report, or returns None if it should be skipped.
+    See `_get_prev_reports()`."""
+    if not doc.exists:
+        return None
+
+    # The fields checked before parsing are read individually, because
+    # to_dict() copies the entire document, and is only worth it for
+    # documents that are not skipped.
+    # Reading fields with doc.get does not cause any extra database reads.
+
+    # Ignore historical (older versions of) reports
+    if skip_historical and _get_field(doc, "historical") == True:
+        return None
+
+    # Verify that doc has a timestamp and retrieve it
+    k = "image.created" if by_image else "timestamp"
+    timestamp = _get_field(doc, k)  # type: Optional[datetime]
+    if not timestamp:
+        logger.warning(f"Document '{doc.id}' has no key '{k}'.")
+        return None
+
+    # Also done when the query has filtered by date, in case the
+    # query fell back on not filtering by date.
+    if timestamp <= cutoff:
+        return None
+    d = doc.to_dict()
+    if not d:  # always check for falsey values
+        return None
+    try:
+        return ReportData(**d)
+    except ValidationError:
+        logger.exception(f"Unable to parse document '{doc.id}'")
+        return None
+
+
+def _get_field(doc: DocumentSnapshot, field_path: str) -> Any:
+    """Returns the value of a (nested) field of a document, or None if it's missing."""
+    try:
+        return doc.get(field_path)
+    except KeyError:
+        return None
+
+
+# Reports created or retrieved recently, keyed by scan ID.
+# Scans are immutable, so a report of a scan can be reused for a while
+# instead of being created from scratch every time it is requested.
+_recent_reports = {}  # type: dict[str, ReportData]
+
+
+def _cache_recent_report(report: ReportData) -> None:
+    if not report.aggregate:
+        _recent_reports[report.id] = report
+
+
+async def get_recent_reports(
+    scan_ids: Sequence[str], collection: str, max_age: timedelta
+) -> dict[str, ReportData]:
+    """Finds the newest report of each scan, if it was created within `max_age`.
+
+    Reports are looked up in an in-process cache first, and only looked up
+    in the database if they are not found there.
+
+    Parameters
+    ----------
+    scan_ids : `Sequence[str]`
+        IDs of the scans to find reports of.
+    collection : `str`
+        The firestore collection to search for reports in.
+    max_age : `timedelta`
+        Maximum age of report to retrieve.
+
+    Returns
+    -------
+    `dict[str, ReportData]`
+        The newest report of each scan, keyed by scan ID.
+        Scans without a recent report are not included.
+    """
+    cutoff = _get_cutoff(max_age)
+
+    def is_recent(report: ReportData) -> bool:
+        timestamp = report.timestamp
+        # Reports created by this service have naive UTC timestamps
+        if timestamp.tzinfo is None:
+            timestamp = timestamp.replace(tzinfo=timezone.utc)
+        return timestamp > cutoff
+
+    # Evict expired reports, so the cache doesn't grow indefinitely
+    for scan_id in [k for k, v in _recent_reports.items() if not is_recent(v)]:
+        del _recent_reports[scan_id]
+
+    reports = {k: _recent_reports[k] for k in scan_ids if k in _recent_reports}
+    missing = [scan_id for scan_id in scan_ids if scan_id not in reports]
+    results = []  # type: list[list[DocumentSnapshot]]
+    if missing:
+        col = get_firestore_client().collection(collection)
+        results = await asyncio.gather(
+            *(
+                _get_recent_report_docs(col, missing[i : i + MAX_IN_VALUES], cutoff)
+                for i in range(0, len(missing), MAX_IN_VALUES)
+            )
+        )
+    for doc in chain.from_iterable(results):
         d = doc.to_dict()
-        if not d:  # always check for falsey values
+        if not d or d.get("aggregate"):
             continue
-
-        # Ignore self when searching for previous scans
-        if ignore_self and d.get("id") == scan.id:
+        try:
+            r = ReportData(**d)
+        except ValidationError:
+            logger.exception(f"Unable to parse document '{doc.id}'")
             continue
+        if is_recent(r) and (
+            r.id not in reports or r.timestamp > reports[r.id].timestamp
+        ):
+            reports[r.id] = r
 
-        # Ignore historical (older versions of) reports
-        #
-        # NOTE: This does not apply for aggregate reports.
-        # Report are only marked historical when a newer report of the _SAME_
-        # image is created. Aggregate reports do not work under the same principle,
-        # since we don't factor in which images are in the aggregate, and thus
-        # every aggregate report is considered to be the same image.
-        if not aggregate and (skip_historical and d.get("historical") == True):
-            continue
+    for report in reports.values():
+        _cache_recent_report(report)
+    return reports
 
-        # Verify that doc has a timestamp and retrieve it
-        if by_image:
-            # XXX: use doc.get instead for nested fields? Is that an extra read?
-            img = d.get("image", {})  # type: dict[str, Any]
-            timestamp = img.get("created")  # type: Optional[datetime]
-        else:
-            timestamp = d.get("timestamp")
-        if not timestamp:
-            k = "image.created" if by_image else "timestamp"
-            logger.warning(f"Document '{doc.id}' has no key '{k}'.")
-            continue
 
-        # Use timezone from doc when comparing
-        if timestamp > cutoff.replace(tzinfo=timestamp.tzinfo):
-            try:
-                r = ReportData(**d)
-            except ValidationError:
-                logger.exception(f"Unable to parse document '{doc.id}'")
-                continue
-            reports.append(r)
+async def _get_recent_report_docs(
+    col: AsyncCollectionReference, scan_ids: list[str], cutoff: datetime
+) -> list[DocumentSnapshot]:
+    """Retrieves the reports of the given scans created after the cutoff.
 
-    # TODO: assert no duplicate ids?
-    return reports
+    A report is logged again every time it is created, so old reports of the
+    scans are filtered out by the query if the composite index for it exists
+    (see setup/firestore.py). Otherwise, they are filtered out by the caller.
+    """
+    query = col.where("id", "in", scan_ids)
+    try:
+        return await query.where("timestamp", ">", cutoff).get()
+    except FailedPrecondition:
+        logger.debug("Composite index missing. Falling back to single key index.")
+        return await query.get()
 
 
 async def mark_reports_historical(
@@ -254,49 +701,63 @@ async def mark_reports_historical(
         # Try to use composite index first
         query_composite = query.where("historical", "==", False)
         query_composite = cast(AsyncQuery, query_composite)  # cast for mypy
-        async for doc in query_composite.stream():
-            await _process_historical_doc(doc, report)
-        logger.debug("Marked historical using composite index.")
+        docs = [
+            doc.reference
+            async for doc in query_composite.stream()
+            if _is_historical(doc, report)
+        ]
+        logger.debug("Found historical reports using composite index.")
     except:  # TODO: should be FailedPrecondition most likely
         # Fallback to iterating over all docs
-        async for doc in query.stream():
-            await _process_historical_doc(doc, report)
-        logger.debug("Marked historical using single key index (iteration).")
+        docs = [
+            doc.reference async for doc in query.stream() if _is_historical(doc, report)
+        ]
+        logger.debug("Found historical reports using single key index (iteration).")
 
+    try:
+        await _mark_historical(client, docs)
+    except:
+        logger.exception(f"Failed to mark documents {docs} as historical")
 
-async def _process_historical_doc(
-    doc: DocumentSnapshot,
-    report: ScanType,
-) -> None:
-    """Process a document and decide whether to mark it as historical."""
+
+def _is_historical(doc: DocumentSnapshot, report: ScanType) -> bool:
+    """Decide whether a document should be marked as historical."""
     d = doc.to_dict()
     if not d:
-        return
+        return False
 
     # We don't have to update existing historical documents
     if d.get("historical") == True:
-        return
+        return False
 
     # Check for presence of timestamp (if not, skip)
     if not (timestamp := d.get("timestamp")) or not isinstance(timestamp, datetime):
         logger.warning(
             f"Document '{doc.id}' has no key 'timestamp' or is not a valid datetime object."
         )
-        return
+        return False
 
     # If doc's timestamp is older than scan's timestamp, mark it as historical
-    if timestamp < report.timestamp.replace(tzinfo=timestamp.tzinfo):
-        try:
-            await _mark_historical(doc.reference)
-        except:
-            logger.exception(f"Failed to mark document '{doc.id}' as historical")
-            return
+    return timestamp < report.timestamp.replace(tzinfo=timestamp.tzinfo)
+
 
+# Maximum number of writes in a single batch
+# See: https://firebase.google.com/docs/firestore/manage-data/transactions#batched-writes
+MAX_BATCH_SIZE = 500
+
+
+async def _mark_historical(
+    client: AsyncClient, docrefs: list[AsyncDocumentReference]
+) -> None:
+    """Marks documents as historical, meaning the documents do not represent
+    the most recent report for the given `image@sha256:hash`.
 
-async def _mark_historical(docref: AsyncDocumentReference) -> WriteResult:
-    """Marks a document as historical, meaning the document does not represent
-    the most recent report for the given `image@sha256:hash`."""
-    return await docref.update({"historical": True, "updated": SERVER_TIMESTAMP})
+    Documents are updated using batched writes."""
+    for i in range(0, len(docrefs), MAX_BATCH_SIZE):
+        batch = client.batch()
+        for docref in docrefs[i : i + MAX_BATCH_SIZE]:
+            batch.update(docref, {"historical": True, "updated": SERVER_TIMESTAMP})
+        await batch.commit()
 
 
 # async def get_documents_query
@@ -318,7 +779,7 @@ async def get_reports_filtered(params: ReportQuery) -> list[dict[str, Any]]:
     # TODO: move this to a separate function in db.py?
     client = get_firestore_client()
 
-    collection = client.collection(AppConfig().collection_reports)
+    collection = client.collection(get_config().collection_reports)
     query = await construct_query(collection, params)
 
     # Query DB
@@ -26,6 +26,10 @@ class LogReportError(Exception):
     pass
 
 
+class ReportRenderError(Exception):
+    pass
+
+
 async def _handle_exception(
     request: Request, exc: Exception, code: int = 500, prefix: str = ""
 ) -> JSONResponse:
@@ -84,6 +88,16 @@ async def handle_PyLaTeXError(request: Request, exc: PyLaTeXError) -> JSONRespon
     return await _handle_exception(request, exc, code=500, prefix="LaTeX error")
 
 
+async def handle_ReportRenderError(
+    request: Request, exc: ReportRenderError
+) -> JSONResponse:
+    """Handles ReportRenderError which stem from documents failing to render."""
+    logger.error(exc)
+    return await _handle_exception(
+        request, exc, code=500, prefix="Failed to generate report"
+    )
+
+
 def install_handlers(app: FastAPI):
     """Installs custom exception handlers for the FastAPI app."""
     # TODO: find out how to type this. How to do type[generic]?
@@ -93,6 +107,7 @@ def install_handlers(app: FastAPI):
         BadRequest: handle_google_BadRequest,
         GoogleAPIError: handle_GoogleAPIError,
         PyLaTeXError: handle_PyLaTeXError,
+        ReportRenderError: handle_ReportRenderError,
     }
     for exc, handler in handlers.items():
         app.add_exception_handler(exc, handler)  # type: ignore
@@ -8,7 +8,10 @@ class Frontend(Enum):
     latex = "latex"
 
 
-SUPPORTED_FRONTENDS = [
-    "latex",
-    # "html", # not supported yet
-]
+# Immutable set for constant-time membership tests
+SUPPORTED_FRONTENDS = frozenset(
+    {
+        "latex",
+        # "html", # not supported yet
+    }
+)
@@ -1,5 +1,9 @@
 import asyncio
 import contextlib
+import os
+import shutil
+import subprocess
+import tempfile
 from datetime import datetime
 from pathlib import Path
 from typing import Any, ContextManager, Final, Type, Union, cast
@@ -31,11 +35,12 @@ from pylatex import (
     Tabular,
     simple_page_number,
 )
+from pylatex.errors import PyLaTeXError
 from pylatex.utils import NoEscape, bold, italic
 from sanitize_filename import sanitize
 
 from ...backends.aggregate import AggregateReport
-from ...types import ScanType
+from ...exceptions import ReportRenderError
 from ...types.protocols import ScanType
 from ..shared.models import PlotData, TableData
 from ..shared.plots import (
@@ -56,31 +61,49 @@ from .utils import hyperlink
 
 # TODO: support aggregate scans
 
-# NOTE ON MUTEX LOCK:
-# We create a mutex here to avoid race conditions that can occur when using
-# both (Py)Latex and Matplotlib.
+# NOTE ON CONCURRENCY:
+# Documents are rendered in a thread pool, and multiple documents can be
+# rendered at the same time.
 #
 # We discovered that figures would be mangled if trying to create multiple documents
 # in parallel when calling plt.clf(), which is not a threadsafe function.
-# We removed the offending plt.clf() calls (they were redundant), however
-# it still proves that the issue exists, and future additions to the code could easily
-# make it resurface if a developer uses a non-threadsafe Matplotlib function.
+# Plots are therefore created with Matplotlib's object-oriented API only
+# (see `frontends.shared.plots`), which does not use any global state.
+# A developer adding plots MUST NOT use `matplotlib.pyplot`.
 #
-# For that reason, we keep the mutex in, as it is safer, and latency is not a huge issue.
-lock = asyncio.Lock()
+# Each document, including its plots, is also written to its own temporary
+# directory, so LaTeX's auxiliary files and the plots of concurrently rendered
+# documents can't clobber each other.
+#
+# Rendering is CPU intensive (table/plot generation and the LaTeX compiler),
+# so we limit the number of documents rendered at once to the number of CPUs.
+render_semaphore = asyncio.Semaphore(os.cpu_count() or 1)
 
 
 async def create_document(
     scan: ScanType, prev_scans: list[ReportData]
 ) -> "LatexDocument":
+    """Renders a PDF report of a scan.
+
+    Parameters
+    ----------
+    scan : `ScanType`
+        The scan to create a report of.
+    prev_scans : `list[ReportData]`
+        Previous reports of the scan's image, used to plot trends.
+
+    Returns
+    -------
+    `LatexDocument`
+        The rendered document. Its PDF is guaranteed to exist at `path`.
+
+    Raises
+    ------
+    ReportRenderError
+        If the PDF could not be rendered.
+    """
     loop = asyncio.get_event_loop()
-    # NOTE: it is safer to use a mutex here, because running Matplotlib
-    # and pylatex in parallel can cause issues.
-    # Calling certain plt.<function> will _very likely_ affect other threads.
-    #
-    # We could of course make the entire function blocking (replace function body with _do_create_document),
-    # but that makes its design inconsistent with the rest of the application code (async).
-    async with lock:
+    async with render_semaphore:
         return await loop.run_in_executor(None, _do_create_document, scan, prev_scans)
 
 
@@ -89,7 +112,18 @@ def _do_create_document(
 ) -> "LatexDocument":
     """NOTE: blocking"""
     d = LatexDocument(scan, prev_scans)
-    d.generate_pdf()
+    try:
+        d.generate_pdf()
+        # The compiler is run with -f, so it can exit successfully
+        # without producing a PDF. Checked here, outside of the event loop.
+        if not d.path.exists():
+            raise ReportRenderError(f"Expected {d.path} to exist, but it doesn't.")
+    except (subprocess.CalledProcessError, PyLaTeXError) as e:
+        d.delete_directory()
+        raise ReportRenderError(f"Failed to render {d.path}: {e}") from e
+    except:
+        d.delete_directory()
+        raise
     return d
 
 
@@ -101,6 +135,8 @@ ROWHEIGHT_MULTIROW: Final[float] = 1.0
 
 
 class LatexDocument:
+    directory: Path
+    basename: str
     filename: str
     plots: list[Path]
     doc: Document
@@ -112,9 +148,17 @@ class LatexDocument:
         # otherwise the PDF will not be generated.
         # PyLatex (or LaTeX itself) does not handle it well.
         # TODO: make self.filename a Path and check if we can write to it?
-        self.directory = "/tmp"  # TODO: use tempfile.gettempdir() or tempfile.mkdtemp()
-        self.filename = f"{self.directory}/{sanitize(scan.id)}".replace(" ", "_")
-        self.doc = self._init_document()  # type: Document
+        # Unique directory per document, so that concurrently rendered documents
+        # never write to the same files. Removed by `delete_directory()`.
+        self.directory = Path(tempfile.mkdtemp(prefix="auspex-"))
+        try:
+            self.basename = sanitize(scan.id).replace(" ", "_")
+            self.filename = f"{self.directory}/{self.basename}"
+            self.doc = self._init_document()  # type: Document
+        except:
+            # The caller has no document to clean up after
+            self.delete_directory()
+            raise
         self.scan = scan
         self.prev_scans = prev_scans
         self.plots = []
@@ -197,6 +241,10 @@ class LatexDocument:
         for plot in self.plots:
             Path(plot).unlink(missing_ok=True)
 
+    def delete_directory(self) -> None:
+        """Deletes the document's directory, including the generated PDF."""
+        shutil.rmtree(self.directory, ignore_errors=True)
+
     def add_packages(self) -> None:
         self.doc.packages.append(Package("hyperref"))
 
@@ -282,21 +330,27 @@ class LatexDocument:
 
     def add_plot_mean_trend(self) -> None:
         """Attempts to add a mean CVSSv3 score trend plot to the document."""
-        plotdata = scatter_mean_trend(self.scan, self.prev_scans)
+        plotdata = scatter_mean_trend(
+            self.scan, self.prev_scans, self.basename, directory=self.directory
+        )
         self._add_section_plot(plotdata)
 
     def add_plot_severity_piechart(self) -> None:
         """Adds pie chart of CVSS severity distribution."""
-        plot = piechart_severity(self.scan, self.filename)
+        plot = piechart_severity(self.scan, self.basename, directory=self.directory)
         self._add_section_plot(plot)
 
     def add_plot_severity_piechart_exploitable(self) -> None:
-        plot_exploitable = piechart_severity(self.scan, self.filename, exploitable=True)
+        plot_exploitable = piechart_severity(
+            self.scan, self.basename, exploitable=True, directory=self.directory
+        )
         self._add_section_plot(plot_exploitable)
 
     def add_plot_scatter_vuln_age(self) -> None:
         """Adds a scatter plot of vulnerability age vs. CVSSv3 score."""
-        plot = scatter_vulnerability_age(self.scan, self.filename)
+        plot = scatter_vulnerability_age(
+            self.scan, self.basename, directory=self.directory
+        )
         self._add_section_plot(plot)
 
     def add_table_exploitable_vulns(self) -> None:
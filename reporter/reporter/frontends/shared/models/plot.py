@@ -15,7 +15,7 @@ class PlotType(Enum):
     HISTOGRAM = auto()
 
 
-@dataclass
+@dataclass(slots=True)
 class PlotData:
     title: str
     plot_type: PlotType
@@ -3,7 +3,7 @@ from dataclasses import dataclass, field
 from typing import Any
 
 
-@dataclass
+@dataclass(slots=True)
 class TableData:
     title: str
     header: list[str] = field(default_factory=list)  # column names
@@ -1,4 +1,5 @@
 from datetime import datetime, timezone
+from operator import attrgetter
 from pathlib import Path
 from typing import Optional
 
@@ -8,18 +9,28 @@ from auspex_core.models.scan import ReportData
 
 matplotlib.use("Agg")  # disable GUI
 import matplotlib.dates as mdates
-import matplotlib.pyplot as plt  # noqa
 import numpy as np
+from matplotlib.axes import Axes
+from matplotlib.figure import Figure
+from matplotlib.lines import Line2D
 from sanitize_filename import sanitize
 
 from ...cve import CVSS_DATE_BRACKETS
 from ...types.protocols import ScanType
-from ...utils.matplotlib import DEFAULT_CMAP
+from ...utils.matplotlib import DEFAULT_CMAP, get_cvss_colors
 from .models import PlotData, PlotType
 
+# Colors and size of data points in the mean score trend plot
+PREV_REPORT_COLOR = "C0"  # Matplotlib's default (blue)
+CURRENT_REPORT_COLOR = "#5acf1b"
+CURRENT_REPORT_SIZE = 100
+
 
 def piechart_severity(
-    report: ScanType, basename: Optional[str] = None, exploitable: bool = False
+    report: ScanType,
+    basename: Optional[str] = None,
+    exploitable: bool = False,
+    directory: Optional[Path] = None,
 ) -> PlotData:
     """Generates a pie chart of the severity distribution of vulnerabilities.
 
@@ -29,6 +40,10 @@ def piechart_severity(
         A report, either a single report or an aggregate report.
     basename : `Optional[str]`
         The basename of the output file.
+    directory : `Optional[Path]`
+        The directory to write the output file to.
+        By default the current working directory.
+
     Returns
     -------
     `PlotData`
@@ -45,7 +60,7 @@ def piechart_severity(
         plot_type=PlotType.PIE,
     )
 
-    fig, ax = plt.subplots()
+    fig, ax = _new_figure()
 
     size = 0.3
     if exploitable:
@@ -59,14 +74,14 @@ def piechart_severity(
     else:
         dist = report.get_distribution_by_severity()
 
-    if all(v == 0 for v in dist.values()):
+    if not any(dist.values()):
         return p
 
     labels = [d.title() for d in dist.keys()]
     values = [d for d in dist.values()]
 
     def get_colors(cmapname):
-        return plt.colormaps[cmapname]([150, 125, 100])
+        return matplotlib.colormaps[cmapname]([150, 125, 100])
 
     low = get_colors("Greens")
     medium = get_colors("Yellows")  # assert this is init
@@ -101,7 +116,7 @@ def piechart_severity(
 
     # Save fig and store its filename
     # TODO: fix filename
-    path = save_fig(fig, report, basename, "piechart_severity")
+    path = save_fig(fig, report, basename, "piechart_severity", directory=directory)
     p.path = path
     p.description = (
         f"The pie chart shows the distribution of {e.lower()}vulnerabilities by severity. "
@@ -112,7 +127,11 @@ def piechart_severity(
 
 
 def scatter_mean_trend(
-    report: ScanType, prev_reports: list[ReportData], basename: Optional[str] = None
+    report: ScanType,
+    prev_reports: list[ReportData],
+    basename: Optional[str] = None,
+    *,
+    directory: Optional[Path] = None,
 ) -> PlotData:
     """Generates a scatter plot of the mean and trend of the CVSS score.
 
@@ -124,6 +143,9 @@ def scatter_mean_trend(
         A list of previous reports.
     basename : `Optional[str]`
         The basename of the output file.
+    directory : `Optional[Path]`
+        The directory to write the output file to.
+        By default the current working directory.
 
     Returns
     -------
@@ -141,7 +163,7 @@ def scatter_mean_trend(
     if len(prev_reports) == 0:
         return p
 
-    fig, ax = plt.subplots()
+    fig, ax = _new_figure()
 
     # Set up axes and labels
     ax.set_title("CVSSv3 Mean Score Over Time")
@@ -150,14 +172,12 @@ def scatter_mean_trend(
     ax.set_ylim(0, 10)
 
     # Plot data
-    scans = []  # type: list[ScanType]
     # TODO: move this timezone fixing to a separate function
-
-    for scan in prev_reports + [report]:  # type: ScanType
+    for scan in (*prev_reports, report):  # type: ScanType
         if scan.timestamp.tzinfo is None:
             scan.timestamp = scan.timestamp.replace(tzinfo=timezone.utc)
-        scans.append(scan)
-    scans = sorted(scans, key=lambda x: x.timestamp)
+
+    scans = sorted((*prev_reports, report), key=attrgetter("timestamp"))
 
     ## IMPORTANT NOTE REGARDING DATES:
     #
@@ -167,20 +187,33 @@ def scatter_mean_trend(
     # This is because we want to be able to support re-scanning older images
     # without these images changing position on the X-axis (time) on the plot,
     # and thus influencing the CVSS score trend line.
-    time = [
-        scan.get_timestamp(image=True, mode=ImageTimeMode.CREATED) for scan in scans
-    ]
-    score = [scan.cvss.mean for scan in scans]
-    # TODO: specify default size of points
-    ax.scatter(time, score)
-
-    # Add newest report to the plot with a different color
-    ax.scatter(
-        [report.get_timestamp(image=True, mode=ImageTimeMode.CREATED)],
-        [report.cvss.mean],
-        color="#5acf1b",
-        s=[100],  # TODO: find out default size, and have this be 1.5x that
+    #
+    # Image creation times can have any UTC offset, so they are converted to
+    # UTC before dropping tzinfo and converting them to a single datetime64
+    # array, which is used both as X-axis values and as input to the trend
+    # line regression.
+    time = np.array(
+        [
+            np.datetime64(
+                scan.get_timestamp(image=True, mode=ImageTimeMode.CREATED)
+                .astimezone(timezone.utc)
+                .replace(tzinfo=None)
+            )
+            for scan in scans
+        ],
+        dtype="datetime64[ns]",
     )
+    score = [scan.cvss.mean for scan in scans]
+
+    # Plot all reports in a single scatter call, and give the newest report
+    # a different color and size by using per-point colors and sizes.
+    # The newest report is not necessarily the last one after sorting.
+    current = next(i for i, scan in enumerate(scans) if scan is report)
+    colors = [PREV_REPORT_COLOR] * len(scans)
+    colors[current] = CURRENT_REPORT_COLOR
+    sizes = np.full(len(scans), matplotlib.rcParams["lines.markersize"] ** 2)
+    sizes[current] = CURRENT_REPORT_SIZE
+    ax.scatter(time, score, c=colors, s=sizes)
 
     # Format dates
     # Make ticks on occurrences of each month:
@@ -190,18 +223,23 @@ def scatter_mean_trend(
     # '%b' means month as locale’s abbreviated name
 
     # Trend line
-    time_ts = [t.timestamp() for t in time]
-    z = np.polyfit(time_ts, score, 1)
-    poly = np.poly1d(z)
-    ax.plot(time, poly(time_ts), color="r")
+    time_ts = time.astype("int64").astype("float64") * 1e-9  # ns -> s
+    slope, intercept = np.polyfit(time_ts, score, 1)
+    ax.plot(time, slope * time_ts + intercept, color="r")
 
     # Add legend and grid
-    fig.legend(["Previous Reports", "Current Report"])
+    # Since both kinds of reports are in the same collection, we have to
+    # create the legend handles ourselves.
+    handles = [
+        Line2D([], [], linestyle="", marker="o", color=PREV_REPORT_COLOR),
+        Line2D([], [], linestyle="", marker="o", color=CURRENT_REPORT_COLOR),
+    ]
+    fig.legend(handles, ["Previous Reports", "Current Report"])
     ax.grid(True)
     ax.set_axisbelow(True)
 
     # Save fig and store its filename
-    p.path = save_fig(fig, report, basename, "scatter_mean_trend")
+    p.path = save_fig(fig, report, basename, "scatter_mean_trend", directory=directory)
     nreports = len(prev_reports) + 1  # prev + current
     p.description = (
         f"Mean CVSSv3 score trend for the {nreports} most recent reports. "
@@ -213,7 +251,7 @@ def scatter_mean_trend(
 
 
 def scatter_vulnerability_age(
-    report: ScanType, basename: Optional[str] = None
+    report: ScanType, basename: Optional[str] = None, directory: Optional[Path] = None
 ) -> PlotData:
     """Generates a scatter plot of the vulnerability age.
 
@@ -223,7 +261,9 @@ def scatter_vulnerability_age(
         A report, either a single report or an aggregate report.
     basename : `Optional[str]`
         The basename of the output file.
-
+    directory : `Optional[Path]`
+        The directory to write the output file to.
+        By default the current working directory.
 
     Returns
     -------
@@ -231,7 +271,7 @@ def scatter_vulnerability_age(
         A plot data object containing everything required to insert
         the plot into the report.
     """
-    fig, ax = plt.subplots()
+    fig, ax = _new_figure()
 
     # Set up axes and labels
     ax.set_title("Vulnerability Age")
@@ -242,8 +282,10 @@ def scatter_vulnerability_age(
     # Plot data
     vulns = report.get_vulns_age_score_color()
     age = [v.timestamp for v in vulns]
-    score = [v.score for v in vulns]
-    color = [v.color for v in vulns]
+    score = np.array([v.score for v in vulns], dtype=np.float64)
+    # Passing colors as a single (N, 4) array lets matplotlib skip
+    # validating each color individually
+    color = get_cvss_colors(score)
 
     ax.scatter(age, score, c=color, cmap=DEFAULT_CMAP)
     ticks = [d.date.days for d in CVSS_DATE_BRACKETS]
@@ -273,7 +315,7 @@ def scatter_vulnerability_age(
         "The age of a vulnerability is based on its publication time. "
     )
 
-    path = save_fig(fig, report, basename, "plot_vuln_age")
+    path = save_fig(fig, report, basename, "plot_vuln_age", directory=directory)
     return PlotData(
         title="Age of Unpatched Vulnerabilities",
         caption="Age of Unpatched Vulnerabilities",
@@ -283,22 +325,38 @@ def scatter_vulnerability_age(
     )
 
 
+def _new_figure() -> tuple[Figure, Axes]:
+    """Creates a new figure with a single set of axes.
+
+    Figures are created directly instead of through `pyplot`, so they are
+    never registered in pyplot's global figure manager. This avoids
+    shared state between plots created in different threads, and means
+    figures don't have to be closed after use.
+    """
+    fig = Figure()
+    ax = fig.subplots()
+    return fig, ax
+
+
 def save_fig(
-    fig: plt.Figure,
+    fig: Figure,
     report: ScanType,
     basename: Optional[str],
     suffix: str,
     filetype: str = "pdf",
-    close_after: bool = True,
+    directory: Optional[Path] = None,
 ) -> Path:
     """Saves a figure to a file.
 
     Parameters
     ----------
-    fig : `plt.Figure`
+    fig : `Figure`
         The figure to save.
     basename : `str`
         The basename of the output file.
+    directory : `Optional[Path]`
+        The directory to write the output file to.
+        By default the current working directory.
 
     Returns
     -------
@@ -311,8 +369,6 @@ def save_fig(
     if filetype:
         fig_filename = f"{fig_filename}.{filetype}"
     fig_filename = sanitize(fig_filename)
-    path = Path(fig_filename).absolute()
+    path = (Path(directory or ".") / fig_filename).absolute()
     fig.savefig(str(path))
-    if close_after:
-        plt.close(fig)
     return path
@@ -3,17 +3,30 @@ This module implements functions that are used to generate the data
 used to display vulnerability tables in reports.
 """
 
-from typing import Any, Optional, cast
+import heapq
+from operator import attrgetter
+from typing import Any, Callable, Iterable, Iterator, Optional, cast
 
 from auspex_core.docker.models import ImageInfo
-from auspex_core.models.cve import CVESeverity
+from auspex_core.models.cve import SEVERITIES, CVESeverity
 from loguru import logger
 
 from ...backends.aggregate import AggregateReport
-from ...types.protocols import ScanType
+from ...types.protocols import ScanType, VulnerabilityType
 from .format import format_decimal
 from .models import Hyperlink, TableData
 
+# Title-cased severity names, looked up instead of calling str.title() per row.
+# Unknown severities fall back on str.title().
+_SEV_TITLE = {severity: severity.title() for severity in SEVERITIES}
+
+# Text of the "Upgradable" column. Matches what the frontends would render
+# the boolean as, but avoids converting it to a new string for every row.
+_UPGRADABLE = {True: "True", False: "False"}
+
+# Sort key for vulnerabilities
+_cvss_score = attrgetter("cvssScore")
+
 
 def top_vulns_table(
     report: ScanType, upgradable: bool, maxrows: Optional[int]
@@ -32,9 +45,14 @@ def top_vulns_table(
     Returns
     -------
     `TableData`
-        A named tuple containing the data used to display the top vulnerabilities.
+        Table data containing the data used to display the top vulnerabilities.
     """
+    is_aggregate = isinstance(report, AggregateReport)
+
+    # Add image column if we have an aggregated report
+    image_column = ["Image"] if is_aggregate else []
     header = [
+        *image_column,
         "Vulnerability",  # Name
         "CVSS ID",  # ID
         "CVSS Score",  # 0-10
@@ -42,12 +60,6 @@ def top_vulns_table(
         "Upgradable",  # Yes/No
     ]
 
-    is_aggregate = isinstance(report, AggregateReport)
-
-    # Add image column if we have an aggregated report
-    if is_aggregate:
-        header.insert(0, "Image")
-
     # HACK: this is a workaround for the fact that ScanType.most_severe_n
     # does not provide us with any information about the image the vulnerability
     # is associated with.
@@ -64,28 +76,18 @@ def top_vulns_table(
     # make the `maxrows` cutoff, and that we also are able to include the image the
     # vulnerability is associated with.
 
-    rows = []
-    reports = []
-    if isinstance(report, AggregateReport):
-        # We have to run isinstance here, lest mypy freaks out
-        reports = report.reports
-    else:
-        reports = [report]
+    # cast() is required to convince mypy that report is an AggregateReport
+    reports = cast(AggregateReport, report).reports if is_aggregate else [report]
 
     # Get list of vulnerabilities per image
-    for r in reports:
-        most_severe = r.most_severe_n(maxrows, upgradable)
-        for vuln in most_severe:
-            row = [
-                vuln.title,
-                Hyperlink(text=vuln.get_id(), url=vuln.url),
-                format_decimal(vuln.cvssScore),  # TODO: format
-                vuln.severity.title(),
-                vuln.is_upgradable,
-            ]
-            if is_aggregate:
-                row.insert(0, r.image.image_name)
-            rows.append(row)
+    rows = list(
+        _iter_vuln_rows(
+            reports,
+            is_aggregate,
+            lambda r: r.most_severe_n(maxrows, upgradable),
+            scores={},
+        )
+    )
 
     up = " Upgradable " if upgradable else " "
     ag = " by Image" if is_aggregate else ""
@@ -119,9 +121,13 @@ def severity_vulns_table(
     Returns
     -------
     `TableData`
-        A named tuple containing the data used to display the vulnerabilities by severity.
+        Table data containing the data used to display the vulnerabilities by severity.
     """
+    # Add image column if we have an aggregated report
+    aggregate = isinstance(report, AggregateReport)
+    image_column = ["Image"] if aggregate else []
     header = [
+        *image_column,
         "Vulnerability",  # Name
         "CVSS ID",  # ID
         "CVSS Score",  # 0-10
@@ -129,40 +135,18 @@ def severity_vulns_table(
         "Upgradable",  # Yes/No
         "Year",
     ]
-    # Add image column if we have an aggregated report
-    aggregate = isinstance(report, AggregateReport)
-    if aggregate:
-        header.insert(0, "Image")
 
-    # Get list of vulnerabilities
-    # TODO: consolidate this method with `top_vulns_table``
-    #       they basically do the same thing
-    rows = []
-    reports = []
-    if isinstance(report, AggregateReport):
-        reports = report.reports
-    else:
-        reports = [report]
+    # Get list of vulnerabilities per image
+    def select(r: ScanType) -> Iterable[VulnerabilityType]:
+        vulns = r.get_vulnerabilities_by_severity(severity)
+        if maxrows is not None:
+            # Partial sort when we only need the top N
+            return heapq.nlargest(maxrows, vulns, key=_cvss_score)
+        return sorted(vulns, key=_cvss_score, reverse=True)
 
-    for r in reports:
-        vulns = list(r.get_vulnerabilities_by_severity(severity))
-        vulns.sort(key=lambda x: x.cvssScore, reverse=True)
-
-        if maxrows is not None and len(vulns) > maxrows:
-            vulns = vulns[:maxrows]
-
-        for vuln in vulns:
-            row = [
-                vuln.title,
-                Hyperlink(text=vuln.get_id(), url=vuln.url),
-                format_decimal(vuln.cvssScore),  # TODO: format
-                vuln.severity.title(),
-                vuln.is_upgradable,
-                vuln.get_year(),
-            ]
-            if aggregate:
-                row.insert(0, r.image.image_name)
-            rows.append(row)
+    reports = cast(AggregateReport, report).reports if aggregate else [report]
+    scores = {}  # type: dict[float, str]
+    rows = list(_iter_vuln_rows(reports, aggregate, select, scores, year=True))
 
     sev = severity.name.title()
     if maxrows:
@@ -180,6 +164,63 @@ def severity_vulns_table(
     return TableData(title, header, rows, description=description)
 
 
+def _iter_vuln_rows(
+    reports: list[ScanType],
+    is_aggregate: bool,
+    select: Callable[[ScanType], Iterable[VulnerabilityType]],
+    scores: dict[float, str],
+    year: bool = False,
+) -> Iterator[list[Any]]:
+    """Generates vulnerability table rows for a list of reports.
+
+    Parameters
+    ----------
+    reports : `list[ScanType]`
+        The reports to create rows for.
+    is_aggregate : `bool`
+        Whether to add the image name of each report as the first cell of its rows.
+    select : `Callable[[ScanType], Iterable[VulnerabilityType]]`
+        Function that selects the vulnerabilities of a report to create rows for.
+    scores : `dict[float, str]`
+        Cache of formatted CVSS scores.
+    year : `bool`, optional
+        Whether to add the year of each vulnerability as the last cell, by default False
+
+    Yields
+    ------
+    `list[Any]`
+        A table row.
+    """
+    for r in reports:
+        # Image column is prepended to each row for aggregated reports
+        image = [r.image.image_name] if is_aggregate else []
+        yield from (
+            _get_vuln_row(vuln, scores, *image, year=year) for vuln in select(r)
+        )
+
+
+def _get_vuln_row(
+    vuln: VulnerabilityType, scores: dict[float, str], *prefix: Any, year: bool = False
+) -> list[Any]:
+    """Creates a table row for a single vulnerability.
+    `prefix` is a sequence of cells to place in front of the vulnerability,
+    and `scores` is a cache of formatted CVSS scores."""
+    score = scores.get(vuln.cvssScore)
+    if score is None:
+        score = scores[vuln.cvssScore] = format_decimal(vuln.cvssScore)
+    row = [
+        *prefix,
+        vuln.title,
+        Hyperlink(text=vuln.get_id(), url=vuln.url),
+        score,
+        _SEV_TITLE.get(vuln.severity) or vuln.severity.title(),
+        _UPGRADABLE[bool(vuln.is_upgradable)],
+    ]
+    if year:
+        row.append(vuln.get_year())
+    return row
+
+
 def statistics_table(report: ScanType) -> TableData:
     """Generates the table data used to display the statistics of a report.
 
@@ -191,9 +232,13 @@ def statistics_table(report: ScanType) -> TableData:
     Returns
     -------
     `TableData`
-        A named tuple containing the data used to display the statistics.
+        Table data containing the data used to display the statistics.
     """
+    # Always add Image as 1st column if we have an aggregated report
+    is_aggregate = isinstance(report, AggregateReport)
+    image_column = ["Image"] if is_aggregate else []
     columns = [
+        *image_column,
         "Median CVSS",
         "Mean CVSS",
         "CVSS Stdev",
@@ -204,33 +249,18 @@ def statistics_table(report: ScanType) -> TableData:
         "C",
         "# Vulns",
     ]
-    # Always add Image as 1st column if we have an aggregated report
-    if isinstance(report, AggregateReport):
-        columns.insert(0, "Image")
-
-    dist = report.get_distribution_by_severity()
-    prio = ["critical", "high", "medium", "low"]
-    # This is flimsy and should be refactored and moved to
-    # a separate function.
-    # We rely on the order defined in the list `prio` above.
-    # TODO: use CVESeverity to define the order
-    highest_severity = "low"  # default to low
-    for p in prio:
-        if dist.get(p):
-            highest_severity = p
-            break
-
-    # FIXME: we don't seem to use this value?
-    highest_severity = highest_severity.title()
 
     rows = []
-    if isinstance(report, AggregateReport):
-        for r in report.reports:
-            row = _get_report_statistics_row(r)
-            row.insert(0, r.image.image_name)
+    if is_aggregate:
+        for r in cast(AggregateReport, report).reports:
+            row = _get_report_statistics_row(
+                r, r.get_distribution_by_severity(), r.image.image_name
+            )
             rows.append(row)
     else:
-        rows.append(_get_report_statistics_row(report))
+        rows.append(
+            _get_report_statistics_row(report, report.get_distribution_by_severity())
+        )
 
     return TableData(
         title="Statistics",
@@ -246,13 +276,18 @@ def statistics_table(report: ScanType) -> TableData:
     )
 
 
-def _get_report_statistics_row(report: ScanType) -> list[Any]:
-    dist = report.get_distribution_by_severity()
+def _get_report_statistics_row(
+    report: ScanType, dist: dict[str, int], *prefix: Any
+) -> list[Any]:
+    """Creates a statistics row for a single report.
+    `prefix` is a sequence of cells to place in front of the statistics."""
+    cvss = report.cvss
     row = [
-        format_decimal(report.cvss.median),
-        format_decimal(report.cvss.mean),
-        format_decimal(report.cvss.stdev),
-        format_decimal(report.cvss.max),
+        *prefix,
+        format_decimal(cvss.median),
+        format_decimal(cvss.mean),
+        format_decimal(cvss.stdev),
+        format_decimal(cvss.max),
         dist["low"],
         dist["medium"],
         dist["high"],
@@ -268,7 +303,7 @@ def cvss_intervals() -> TableData:
     Returns
     -------
     `TableData`
-        A named tuple containing the data used to display the CVSSv3 severity intervals.
+        Table data containing the data used to display the CVSSv3 severity intervals.
     """
     columns = [
         "Low",
@@ -313,7 +348,7 @@ def image_info(report: ScanType, digest_limit: Optional[int] = 8) -> TableData:
     Returns
     -------
     `TableData`
-        A named tuple containing the data used to display the statistics of an image.
+        Table data containing the data used to display the statistics of an image.
     """
     columns = [
         "Image",
@@ -326,12 +361,9 @@ def image_info(report: ScanType, digest_limit: Optional[int] = 8) -> TableData:
     if isinstance(report, AggregateReport):
         for r in report.reports:
             rows.append(_get_image_info_row(r.image, digest_limit))
-    else:
-        rows.append(_get_image_info_row(report.image, digest_limit))
-
-    if isinstance(report, AggregateReport):
         title = "Images in This Report"
     else:
+        rows.append(_get_image_info_row(report.image, digest_limit))
         title = "Image Information"
     return TableData(
         title=title,
@@ -345,11 +377,13 @@ def image_info(report: ScanType, digest_limit: Optional[int] = 8) -> TableData:
 def _get_image_info_row(image: ImageInfo, digest_limit: Optional[int]) -> list[str]:
     # Move this to ImageInfo.get_digest(maxlen=8)?
     digest = "-"
-    if image.digest is not None:
-        if ":" in image.digest:
-            digest = image.digest.split(":")[1]
-        if digest_limit and len(digest) > digest_limit:
+    if image.digest:
+        # Strip the algorithm prefix (e.g. "sha256:") if present
+        _, sep, rest = image.digest.partition(":")
+        digest = rest if sep else image.digest
+        if digest_limit:
             digest = digest[:digest_limit]  # + "..."
+        digest = digest or "-"
 
     # Move to ImageInfo.get_tags()?
     if image.tag:
@@ -363,7 +397,8 @@ def _get_image_info_row(image: ImageInfo, digest_limit: Optional[int]) -> list[s
 
     return [
         image.image_name or "-",
-        image.created.strftime("%Y-%m-%d %H:%M:%S"),
+        # Drop tzinfo so isoformat() doesn't append a UTC offset
+        image.created.replace(tzinfo=None).isoformat(sep=" ", timespec="seconds"),
         tags,
         digest,
     ]
@@ -380,7 +415,7 @@ def exploitable_vulns(report: ScanType) -> TableData:
     Returns
     -------
     `TableData`
-        A named tuple containing the data used to display the exploitable vulnerabilities.
+        Table data containing the data used to display the exploitable vulnerabilities.
     """
     td = TableData(
         title="Exploitable Vulnerabilities",
@@ -394,15 +429,8 @@ def exploitable_vulns(report: ScanType) -> TableData:
         "Upgradable",
     ]
 
-    for vuln in report.get_exploitable():
-        row = [
-            vuln.title,
-            Hyperlink(text=vuln.get_id(), url=vuln.url),
-            format_decimal(vuln.cvssScore),  # TODO: format
-            vuln.severity.title(),
-            vuln.is_upgradable,
-        ]
-        td.rows.append(row)
+    scores = {}  # type: dict[float, str]
+    td.rows = [_get_vuln_row(vuln, scores) for vuln in report.get_exploitable()]
 
     if not td.rows:
         td.description = "No exploitable vulnerabilities found."
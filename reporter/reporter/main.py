@@ -1,41 +1,60 @@
 # NOTE: ONLY SUPPORTS GCP RIGHT NOW
 import asyncio
+from contextlib import suppress
 from dataclasses import dataclass
 from datetime import timedelta
 from functools import partial
 from typing import Optional
 
 from auspex_core.gcp.firestore import check_db_exists
-from auspex_core.models.api.report import ReportOut, ReportQuery, ReportRequestIn
+from auspex_core.gcp.storage import close_storage_clients
+from auspex_core.models.api.report import (
+    FailedReport,
+    ReportOut,
+    ReportQuery,
+    ReportRequestIn,
+)
 from auspex_core.models.scan import ReportData
 from auspex_core.models.status import ServiceStatus, ServiceStatusCode
 from fastapi import Depends, FastAPI, Request
 from fastapi.exceptions import HTTPException
 from loguru import logger
 
-from .backends.aggregate import AggregateReport
-from .config import AppConfig
-from .db import get_reports_filtered
+from .config import get_config
+from .db import get_reports_filtered, wait_for_background_tasks
 from .exceptions import install_handlers
-from .report import SingleReportResult, create_aggregate_report, create_single_report
+from .report import (
+    create_aggregate_report,
+    create_single_reports,
+    get_prev_aggregate_reports,
+)
 from .types.protocols import ScanType
+from .utils.http import close_http_client
 
 app = FastAPI()
 install_handlers(app)
 
-# Add mock routes for internal development
-from contextlib import suppress
-
-with suppress(ImportError):
-    from ._mock import mockrouter
-
-    app.include_router(mockrouter)
-
 
 @app.on_event("startup")
 async def on_app_startup():
     # instantiate config to check that all envvars are defined
-    AppConfig()
+    config = get_config()
+
+    # Add mock routes for internal development.
+    # Only imported in debug mode, since the module (and its dependencies)
+    # is otherwise just dead weight on every cold start.
+    if config.debug:
+        with suppress(ImportError):
+            from ._mock import mockrouter
+
+            app.include_router(mockrouter)
+
+
+@app.on_event("shutdown")
+async def on_app_shutdown():
+    await wait_for_background_tasks()
+    await close_storage_clients()
+    await close_http_client()
 
 
 @app.post("/reports", response_model=ReportOut)
@@ -44,41 +63,58 @@ async def generate_report(r: ReportRequestIn):
     # Create single reports in parallel
     # See frontends/latex/latex.py for limitations
     # TODO: use multiprocessing instead
-    results = await asyncio.gather(
-        *[create_single_report(scan_id, r) for scan_id in r.scan_ids],
-        # We don't need to do return_exceptions=True
-        # because we're already catching exceptions
-    )
-
-    failed = [r for r in results if r.error]  # type: list[SingleReportResult]
-    if failed:
-        detail = {
-            "message": f"One or more scans failed to be parsed.",
-            "scans": [r.scan_id for r in failed],
-        }
-        # TODO: fix this message
-        if not r.ignore_failed:
-            raise HTTPException(status_code=500, detail=detail)
-
-    # TODO: check if any reports contain the same image
-    # if so, select the newest one
-
-    reports = [r.report for r in results if r.report]  # type: list[ScanType]
-    reports_out = [
-        r.report_data for r in results if r.report_data
-    ]  # type: list[ReportData]
-
-    # Create aggregate report if specified and there are multiple reports
-    aggregate: Optional[AggregateReport] = None
+    #
+    # Each result is handled as soon as its report is done.
+    # We don't need to handle exceptions here, because create_single_reports()
+    # stores them in the results.
     msg = ""
+    prev_aggregates = None  # type: Optional[asyncio.Task[list[ReportData]]]
     if r.aggregate:
-        if len(reports) > 1:
-            aggregate = await create_aggregate_report(reports, r)
+        if len(r.scan_ids) > 1:
+            # Previous aggregate reports don't depend on the reports being
+            # aggregated, so we look them up while the reports are created.
+            prev_aggregates = asyncio.create_task(get_prev_aggregate_reports())
         else:
             msg = "Aggregate report requested but only one scan was provided."
             logger.warning(msg)
-    # TODO: determine failed scans and return them in the response
-    return ReportOut(reports=reports_out, aggregate=aggregate, message=msg, failed=[])
+
+    failed = []  # type: list[FailedReport]
+    reports = []  # type: list[ScanType]
+    reports_out = []  # type: list[ReportData]
+    try:
+        async for res in create_single_reports(r.scan_ids, r):
+            if res.error:
+                failed.append(FailedReport(scan_id=res.scan_id, error=str(res.error)))
+            if res.report:
+                reports.append(res.report)
+            if res.report_data:
+                reports_out.append(res.report_data)
+
+        # The error detail is only built if it's actually raised
+        if failed and not r.ignore_failed:
+            detail = {
+                "message": f"One or more scans failed to be parsed.",
+                "scans": [f.scan_id for f in failed],
+            }
+            # TODO: fix this message
+            raise HTTPException(status_code=500, detail=detail)
+
+        # Create aggregate report if specified and there are multiple reports
+        aggregate: Optional[ReportData] = None
+        if prev_aggregates:
+            if len(reports) > 1:
+                aggregate = await create_aggregate_report(
+                    reports, r, await prev_aggregates
+                )
+            else:
+                msg = "Aggregate report requested but only one scan succeeded."
+                logger.warning(msg)
+    finally:
+        if prev_aggregates:
+            prev_aggregates.cancel()
+    return ReportOut(
+        reports=reports_out, aggregate=aggregate, message=msg, failed=failed
+    )
 
 
 @app.get("/reports")  # name TBD
@@ -97,7 +133,7 @@ async def get_reports(
 async def get_status(request: Request) -> ServiceStatus:
     """Get the status of the service."""
     status = partial(ServiceStatus, url=request.url)
-    if await check_db_exists(AppConfig().collection_reports):
+    if await check_db_exists(get_config().collection_reports):
         return status(
             status=ServiceStatusCode.OK,
         )
@@ -1,25 +1,33 @@
+import asyncio
+import json
+import time
 from dataclasses import dataclass
 from datetime import timedelta
-from json import JSONDecodeError
-from typing import Any, Optional
+from functools import partial
+from typing import Any, AsyncIterator, Optional
 
-import httpx
-from auspex_core.gcp.storage import fetch_json_blob
 from auspex_core.models.api.report import ReportRequestIn
 from auspex_core.models.scan import ReportData, ScanLog
+from auspex_core.utils.concurrency import bounded_as_completed
 from fastapi import HTTPException
 from loguru import logger
+from pydantic import ValidationError
 
-from .backends import get_backend
+from .backends import ParseFunc, get_backend
 from .backends.aggregate import AggregateReport
-from .config import AppConfig
-from .db import get_prev_scans, log_report
+from .config import get_config
+from .db import (
+    get_prev_scans,
+    get_prev_scans_bulk,
+    get_recent_reports,
+    log_report_in_background,
+)
 from .frontends.latex import create_document
 from .types.protocols import ScanType
-from .utils.storage import upload_report_to_bucket
+from .utils.http import get_http_client
+from .utils.storage import fetch_scan_blob, upload_report_to_bucket
 
 
-# Class to collect results from asyncio.gather
 @dataclass
 class SingleReportResult:
     """Class that collects results from an asynchronous create_single_report() task"""
@@ -30,33 +38,186 @@ class SingleReportResult:
     error: Optional[Exception] = None
 
 
+async def create_single_reports(
+    scan_ids: list[str], settings: ReportRequestIn
+) -> AsyncIterator[SingleReportResult]:
+    """Creates a report for each scan, and yields the results as they complete.
+
+    Parameters
+    ----------
+    scan_ids : `list[str]`
+        IDs of the scans to create reports of.
+    settings : `ReportRequestIn`
+        The settings to use for the reports.
+
+    Yields
+    ------
+    `SingleReportResult`
+        The result of each report.
+        Exceptions are not raised, but stored in the result.
+    """
+    # Scans are immutable, so reports created recently can be reused
+    cached = await get_cached_reports(scan_ids, settings)
+    # Reused reports only have to be parsed if they are to be aggregated
+    if not (settings.aggregate and len(scan_ids) > 1):
+        for scan_id, report_data in cached.items():
+            yield SingleReportResult(scan_id=scan_id, report_data=report_data)
+        scan_ids = [scan_id for scan_id in scan_ids if scan_id not in cached]
+
+    scans = {}  # type: dict[str, ScanLog]
+    results = await asyncio.gather(
+        *(fetch_scan(scan_id) for scan_id in scan_ids), return_exceptions=True
+    )
+    for scan_id, scan in zip(scan_ids, results):
+        if isinstance(scan, Exception):
+            yield SingleReportResult(scan_id=scan_id, error=scan)
+        else:
+            scans[scan_id] = scan
+    scans = _dedupe_scans(scans)
+    if not scans:
+        return
+
+    # The previous reports of all scans are looked up together with as few
+    # queries as possible, while the scans themselves are being parsed.
+    # They are only used to plot trends in individual documents, so they
+    # are not needed for reused reports, or if only an aggregate is requested.
+    if settings.individual:
+        to_render = [scan for scan_id, scan in scans.items() if scan_id not in cached]
+    else:
+        to_render = []
+    prev_scans = asyncio.ensure_future(
+        get_prev_scans_bulk(
+            to_render,
+            collection=get_config().collection_reports,
+            max_age=timedelta(weeks=get_config().trend_weeks),
+            ignore_self=True,
+            skip_historical=False,  # FIXME: set to True & should be envvar
+        )
+    )
+    try:
+        # Limit the number of reports being created at once, so that large
+        # requests don't hold every parsed scan in memory at the same time.
+        async for res in bounded_as_completed(
+            (
+                create_single_report(
+                    scan_id, scan, settings, prev_scans, cached.get(scan_id)
+                )
+                for scan_id, scan in scans.items()
+            ),
+            get_config().max_concurrency,
+        ):
+            yield res
+    finally:
+        prev_scans.cancel()
+
+
+def _dedupe_scans(scans: dict[str, ScanLog]) -> dict[str, ScanLog]:
+    """Removes scans of the same image (by digest), keeping the newest scan.
+
+    This is done before the scans are parsed, so the redundant scans are
+    never downloaded.
+
+    Parameters
+    ----------
+    scans : `dict[str, ScanLog]`
+        Scans keyed by scan ID.
+
+    Returns
+    -------
+    `dict[str, ScanLog]`
+        Scans keyed by scan ID, with at most one scan per image.
+    """
+    newest = {}  # type: dict[tuple[Optional[str], str], str]
+    for scan_id, scan in scans.items():
+        if not scan.image.digest:  # can't tell if it's the same image
+            continue
+        key = (scan.image.image, scan.image.digest)
+        if key not in newest or scan.timestamp > scans[newest[key]].timestamp:
+            newest[key] = scan_id
+    keep = set(newest.values())
+    deduped = {}  # type: dict[str, ScanLog]
+    for scan_id, scan in scans.items():
+        if not scan.image.digest or scan_id in keep:
+            deduped[scan_id] = scan
+        else:
+            logger.info(f"Skipping scan '{scan_id}', a newer scan of its image exists.")
+    return deduped
+
+
+async def get_cached_reports(
+    scan_ids: list[str], settings: ReportRequestIn
+) -> dict[str, ReportData]:
+    """Finds reports of the scans that were created recently enough to be reused.
+
+    Parameters
+    ----------
+    scan_ids : `list[str]`
+        IDs of the scans to find reports of.
+    settings : `ReportRequestIn`
+        The settings of the requested reports.
+
+    Returns
+    -------
+    `dict[str, ReportData]`
+        Reusable reports, keyed by scan ID.
+    """
+    ttl = get_config().cache_ttl
+    if ttl <= 0:
+        return {}
+    try:
+        reports = await get_recent_reports(
+            scan_ids, get_config().collection_reports, timedelta(seconds=ttl)
+        )
+    except Exception as e:
+        # Not being able to reuse reports is not fatal, they are just recreated
+        logger.opt(exception=e).warning("Failed to look up recent reports")
+        return {}
+    # A report without a PDF can't be reused if a PDF is requested
+    return {
+        scan_id: report
+        for scan_id, report in reports.items()
+        if report.report_url or not settings.individual
+    }
+
+
 async def create_single_report(
-    scan_id: str, settings: ReportRequestIn
+    scan_id: str,
+    scan: ScanLog,
+    settings: ReportRequestIn,
+    prev_scans: "asyncio.Future[dict[str, list[ReportData]]]",
+    cached: Optional[ReportData] = None,
 ) -> SingleReportResult:
     r = SingleReportResult(
         scan_id=scan_id,
     )
     try:
-        r.report = await get_report(scan_id)
-        prev_scans = await get_prev_scans(
-            r.report,
-            collection=AppConfig().collection_reports,
-            max_age=timedelta(weeks=AppConfig().trend_weeks),
-            ignore_self=True,
-            skip_historical=False,  # FIXME: set to True & should be envvar
+        if cached:
+            # The report is reused, and the scan is only parsed to be aggregated
+            r.report = await _parse_scan(scan)
+            r.report_data = cached
+            return r
+
+        # The future is shared by all reports, so it must not be cancelled
+        # if creating this report fails.
+        r.report, all_prev_scans = await asyncio.gather(
+            _parse_scan(scan), asyncio.shield(prev_scans)
         )
         # TODO: add support for multiple frontends
         # Right not we just assume it's latex
 
         # Create and upload the LaTeX document
-        r.report_data = await create_and_upload_report(r.report, prev_scans, settings)
+        r.report_data = await create_and_upload_report(
+            r.report, all_prev_scans.get(scan.id, []), settings
+        )
     except Exception as e:
         r.error = e
     return r
 
 
 async def create_aggregate_report(
-    reports: list[ScanType], settings: ReportRequestIn
+    reports: list[ScanType],
+    settings: ReportRequestIn,
+    prev_scans: Optional[list[ReportData]] = None,
 ) -> ReportData:
     """Creates an aggregate report from a list of reports.
 
@@ -66,6 +227,9 @@ async def create_aggregate_report(
         A list of reports to aggregate.
     settings : `ReportRequestIn`
         The settings to use for the aggregate report.
+    prev_scans : `Optional[list[ReportData]]`, optional
+        Previous aggregate reports, as returned by `get_prev_aggregate_reports()`.
+        Fetched if not provided.
 
     Returns
     -------
@@ -78,15 +242,41 @@ async def create_aggregate_report(
         If the aggregate report fails to be created.
     """
     report = AggregateReport(reports=reports)
-    prev_scans = await get_prev_scans(
+    if prev_scans is None:
+        prev_scans = await get_prev_aggregate_reports(report)
+    return await create_and_upload_report(report, prev_scans, settings)
+
+
+async def get_prev_aggregate_reports(
+    report: Optional[AggregateReport] = None,
+) -> list[ReportData]:
+    """Fetches previous aggregate reports.
+
+    Aggregate reports are not looked up by image, so this does not depend
+    on the contents of the aggregate report, and can be done while
+    the reports to aggregate are still being created.
+
+    Parameters
+    ----------
+    report : `Optional[AggregateReport]`, optional
+        The aggregate report to exclude from the results, if any.
+
+    Returns
+    -------
+    `list[ReportData]`
+        Previous aggregate reports.
+    """
+    if report is None:
+        # Only the ID is used, and a new aggregate report is never logged yet
+        report = AggregateReport(reports=[])
+    return await get_prev_scans(
         report,
-        collection=AppConfig().collection_reports,
-        max_age=timedelta(weeks=AppConfig().trend_weeks),
+        collection=get_config().collection_reports,
+        max_age=timedelta(weeks=get_config().trend_weeks),
         ignore_self=True,
         skip_historical=False,  # NOTE: MUST be False for aggregate reports. Aggregates can't be historical.
         aggregate=True,
     )
-    return await create_and_upload_report(report, prev_scans, settings)
 
 
 async def get_report(scan_id: str) -> ScanType:
@@ -106,9 +296,20 @@ async def get_report(scan_id: str) -> ScanType:
     return await _parse_scan(scan)
 
 
+# Scan logs fetched recently: scan ID -> (time of fetch, scan log).
+# Scans are immutable, so their logs can be reused for a while.
+_scan_logs = {}  # type: dict[str, tuple[float, ScanLog]]
+# Scan logs currently being fetched, so that concurrent requests for the
+# same scan share a single request to the scanner service.
+_pending_scan_logs = {}  # type: dict[str, asyncio.Future[ScanLog]]
+
+
 async def fetch_scan(scan_id: str) -> ScanLog:
     """Fetches a scan from the scanner service.
 
+    Scans fetched within the last `AppConfig.cache_ttl` seconds are
+    reused instead of being fetched again.
+
     Parameters
     ----------
     scan_id : `str`
@@ -119,15 +320,41 @@ async def fetch_scan(scan_id: str) -> ScanLog:
     scan : `ScanLog`
         The scan object.
     """
-    # TODO: make timeout configurable (and standardized?)
-    async with httpx.AsyncClient(timeout=30) as client:
-        url = f"{AppConfig().url_scanner}/scans/{scan_id}"
-        r = await client.get(url)
-        if r.status_code != 200:
-            raise HTTPException(status_code=r.status_code, detail=r.text)
+    now = time.monotonic()
+    ttl = get_config().cache_ttl
+    # Evict expired scan logs, so the cache doesn't grow indefinitely
+    for k in [k for k, (t, _) in _scan_logs.items() if now - t >= ttl]:
+        del _scan_logs[k]
+    if scan_id in _scan_logs:
+        return _scan_logs[scan_id][1]
+
+    fut = _pending_scan_logs.get(scan_id)
+    if fut is None:
+        fut = asyncio.ensure_future(_fetch_scan(scan_id))
+        _pending_scan_logs[scan_id] = fut
+        fut.add_done_callback(partial(_on_scan_fetched, scan_id))
+    # Cancelling one caller must not cancel the fetch for the others
+    return await asyncio.shield(fut)
+
+
+def _on_scan_fetched(scan_id: str, fut: "asyncio.Future[ScanLog]") -> None:
+    del _pending_scan_logs[scan_id]
+    # Failed fetches (e.g. scans not found) are not cached
+    if not fut.cancelled() and not fut.exception() and get_config().cache_ttl > 0:
+        _scan_logs[scan_id] = (time.monotonic(), fut.result())
+
+
+async def _fetch_scan(scan_id: str) -> ScanLog:
+    """Fetches a scan from the scanner service. See `fetch_scan()`."""
+    url = f"{get_config().url_scanner}/scans/{scan_id}"
+    r = await get_http_client().get(url)
+    if r.status_code != 200:
+        raise HTTPException(status_code=r.status_code, detail=r.text)
+    # Decode and validate the raw response in one step.
+    # Invalid JSON is also raised as a ValidationError.
     try:
-        scan = ScanLog(**r.json())
-    except JSONDecodeError as e:
+        scan = ScanLog.parse_raw(r.content)
+    except ValidationError:
         raise HTTPException(
             status_code=500, detail=f"Could not parse response: {r.text}"
         )
@@ -151,18 +378,29 @@ async def _parse_scan(scan: ScanLog) -> ScanType:
         the `ScanType` interface.
     """
     # TODO: support aggregate
-    obj = await fetch_json_blob(scan.bucket, scan.blob)
+    content = await fetch_scan_blob(scan.bucket, scan.blob)
     backend = get_backend(scan.backend)
-    return backend(scan, obj.content)
+    # Decoding and validating a large scan is CPU intensive, so we do it
+    # in an executor to avoid blocking the event loop while doing so.
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(None, _decode_and_parse, backend, scan, content)
+
+
+def _decode_and_parse(backend: ParseFunc, scan: ScanLog, content: bytes) -> ScanType:
+    """NOTE: blocking"""
+    return backend(scan, json.loads(content))
 
 
 async def fetch_raw_scan(url: str) -> dict[str, Any]:
     """Downloads a raw scan from the URL and parses it as JSON."""
-    async with httpx.AsyncClient() as client:
-        r = await client.get(url)
+    r = await get_http_client().get(url)
     if r.status_code != 200:
         raise HTTPException(status_code=r.status_code, detail=r.text)
-    return r.json()
+    # Raw scans can be several megabytes, so we decode them in an executor
+    # to avoid blocking the event loop. json.loads() accepts the bytes
+    # directly, so no decoded copy of the response is made.
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(None, json.loads, r.content)
 
 
 async def create_and_upload_report(
@@ -178,19 +416,21 @@ async def create_and_upload_report(
     aggregate = report.is_aggregate or isinstance(report, AggregateReport)
     if aggregate or settings.individual:
         doc = await create_document(report, prev_scans)
-        if not doc.path.exists():
-            logger.error(f"Expected {doc.path} to exist, but it doesn't. Exiting.")
-            raise HTTPException(500, "Failed to generate report.")
-        status = await upload_report_to_bucket(doc.path, AppConfig().bucket_reports)
-        report_url = status.mediaLink
-
-    # FIXME: we don't mark the previous scans historical until here
-    #    because we create the report, THEN log and mark the previous scans
-    #
-    # Edit 2022-05-08: I'm not sure why this is an issue?
+        try:
+            status = await upload_report_to_bucket(
+                doc.path, get_config().bucket_reports
+            )
+            report_url = status.mediaLink
+        finally:
+            doc.delete_directory()
+
+    # The report is logged in the background, since the response doesn't
+    # depend on the result of the database writes. The previous scans are
+    # marked historical by the same background task once the report is stored.
+    # Only creating the report's database representation can fail here.
     try:
-        report = await log_report(report, report_url, aggregate)
-    except Exception as e:
-        logger.error(f"Failed to log report: {e}")
-        raise HTTPException(500, f"Failed to log report: {e}")
+        report = log_report_in_background(report, report_url, aggregate)
+    except ValidationError as e:
+        logger.error(f"Failed to create report data: {e}")
+        raise HTTPException(500, f"Failed to create report data: {e}")
     return report
@@ -1,4 +1,4 @@
-from .firestore import get_firestore_document
+from .firestore import get_firestore_document, get_firestore_documents
 from .matplotlib import get_cvss_color
 from .npmath import mean, median, stdev
 from .storage import upload_report_to_bucket
@@ -1,10 +1,9 @@
-from auspex_core.gcp.firestore import get_document, get_firestore_client
+from auspex_core.exceptions import DocumentNotFound
+from auspex_core.gcp.firestore import get_document, get_documents, get_firestore_client
 from fastapi.exceptions import HTTPException
 from google.cloud.firestore_v1 import DocumentSnapshot
 from loguru import logger
 
-from ..config import AppConfig
-
 
 async def get_firestore_document(document_id: str, collection: str) -> DocumentSnapshot:
     """Wrapper around `auspex_core.firestore.get_document` that handles
@@ -33,11 +32,50 @@ async def get_firestore_document(document_id: str, collection: str) -> DocumentS
         doc = await get_document(collection, document_id)
     except Exception as e:
         msg = f"Failed to retrieve document '{collection}/{document_id}'"
-        logger.exception(msg)
-        if e.args and "not found" in e.args[0].lower():
-            msg = e.args[0]
-            code = 404
-        else:
-            code = 500
-        raise HTTPException(code, msg)
+        raise _get_http_exception(e, msg)
     return doc
+
+
+async def get_firestore_documents(
+    document_ids: list[str], collection: str
+) -> list[DocumentSnapshot]:
+    """Wrapper around `auspex_core.firestore.get_documents` that fetches
+    multiple documents in a single request, and handles exceptions and
+    logging for the service.
+
+    Parameters
+    ----------
+    document_ids : `list[str]`
+        The IDs of the documents to fetch.
+    collection : `str`
+        The collection the documents are stored in.
+
+    Returns
+    -------
+    `list[DocumentSnapshot]`
+        Firestore Documents, in the same order as `document_ids`.
+
+    Raises
+    ------
+    `HTTPException`
+        FastAPI HTTPException that is propagated to the user in the event
+        of a failure.
+    """
+    try:
+        docs = await get_documents(collection, document_ids)
+    except Exception as e:
+        msg = f"Failed to retrieve documents {document_ids} from '{collection}'"
+        raise _get_http_exception(e, msg)
+    return docs
+
+
+def _get_http_exception(e: Exception, msg: str) -> HTTPException:
+    """Logs a failed document retrieval and creates an HTTPException for it.
+    Documents that don't exist result in a 404, everything else in a 500."""
+    if isinstance(e, DocumentNotFound):
+        # Missing documents are an expected client error, so the
+        # traceback is not worth capturing and formatting here.
+        logger.warning(f"{msg}: {e}")
+        return HTTPException(e.status_code, str(e))
+    logger.exception(msg)
+    return HTTPException(500, msg)
@@ -0,0 +1,39 @@
+import asyncio
+from weakref import WeakKeyDictionary
+
+import httpx
+
+# The HTTP client is shared between requests, so that connections to other
+# services are kept alive instead of being re-established for every request.
+# The client's connection pool is bound to the event loop it was created in,
+# hence we keep one client per event loop.
+_clients: WeakKeyDictionary[
+    asyncio.AbstractEventLoop, httpx.AsyncClient
+] = WeakKeyDictionary()
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Returns a shared HTTP client for the running event loop.
+
+    The client must not be closed by the caller (e.g. by using it as a
+    context manager). Use `close_http_client()` to close it on shutdown.
+
+    Returns
+    -------
+    `httpx.AsyncClient`
+        Async HTTP client.
+    """
+    loop = asyncio.get_running_loop()
+    client = _clients.get(loop)
+    if client is None:
+        # TODO: make timeout configurable (and standardized?)
+        client = httpx.AsyncClient(timeout=30)
+        _clients[loop] = client
+    return client
+
+
+async def close_http_client() -> None:
+    """Closes the shared HTTP client of the running event loop, if any."""
+    client = _clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
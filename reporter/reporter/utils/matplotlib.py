@@ -2,6 +2,7 @@ import matplotlib as mpl
 import numpy as np
 from matplotlib.cm import get_cmap
 from matplotlib.colors import Colormap, ListedColormap
+from numpy.typing import ArrayLike, NDArray
 
 from ..types.nptypes import MplRGBAColor
 
@@ -29,3 +30,18 @@ def get_cvss_color(score: float, cmap: Colormap = DEFAULT_CMAP) -> MplRGBAColor:
         cmap._init()  # call _init() so we can access the _lut attribute
     idx = int((score / 10) * len(cmap._lut)) - 1
     return cmap._lut[idx]
+
+
+def get_cvss_colors(
+    scores: ArrayLike, cmap: Colormap = DEFAULT_CMAP
+) -> NDArray[np.float64]:
+    """Vectorized version of `get_cvss_color`.
+
+    Returns an array of shape (N, 4), where each row is the RGBA color of
+    the corresponding score.
+    """
+    if not hasattr(cmap, "_lut"):
+        cmap._init()  # call _init() so we can access the _lut attribute
+    scores = np.asarray(scores, dtype=np.float64)
+    idx = (scores / 10 * len(cmap._lut)).astype(np.intp) - 1
+    return cmap._lut[idx]
@@ -1,4 +1,5 @@
-from typing import Any, Callable, Iterable
+import math
+from typing import Any, Callable, Iterable, Sequence
 
 import numpy as np
 from loguru import logger
@@ -25,8 +26,12 @@ def _do_stats_math(
 ) -> float:
     """Wrapper function around numpy stats functions that handles exceptions and NaN."""
     try:
-        res = func(a)
-        if np.isnan(res):
+        # numpy can't compute stats of iterators, so they are collected first
+        if not isinstance(a, (np.ndarray, Sequence)):
+            a = list(a)
+        # math.isnan on a float is cheaper than calling the np.isnan ufunc
+        res = float(func(a))
+        if math.isnan(res):
             logger.warning(
                 f"{func.__name__}({repr(a)}) returned nan. Defaulting to {default}"
             )
@@ -34,4 +39,4 @@ def _do_stats_math(
     except Exception as e:
         logger.error(f"{func.__name__}({repr(a)}) failed. Defaulting to {default}", e)
         return default
-    return float(res)
+    return res
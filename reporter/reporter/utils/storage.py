@@ -1,6 +1,9 @@
+from collections import OrderedDict
 from pathlib import Path
 
-from auspex_core.gcp.storage import ObjectStatus, upload_file_to_bucket
+from auspex_core.gcp.storage import ObjectStatus, download_blob, upload_file_to_bucket
+
+from ..config import get_config
 
 
 async def upload_report_to_bucket(
@@ -34,3 +37,43 @@ async def upload_report_to_bucket(
         # Ignore if the file doesn't exist somehow (it should)
         path.unlink(missing_ok=True)
     return status
+
+
+# Scan blobs are never modified once they are uploaded, so their contents can
+# be cached. Least recently used blobs are evicted once the total size of the
+# cache exceeds `AppConfig.blob_cache_mb`.
+_blob_cache = OrderedDict()  # type: OrderedDict[tuple[str, str], bytes]
+_blob_cache_size = 0
+
+
+async def fetch_scan_blob(bucket: str, blob: str) -> bytes:
+    """Downloads the raw contents of a scan blob, or retrieves them from
+    the cache if the blob has been downloaded recently.
+
+    Parameters
+    ----------
+    bucket : `str`
+        Cloud storage bucket containing the blob.
+    blob : `str`
+        Name of the blob.
+
+    Returns
+    -------
+    `bytes`
+        Contents of the blob.
+    """
+    global _blob_cache_size
+    key = (bucket, blob)
+    if key in _blob_cache:
+        _blob_cache.move_to_end(key)
+        return _blob_cache[key]
+
+    content = await download_blob(bucket, blob)
+    if key not in _blob_cache:  # could have been added while downloading
+        _blob_cache[key] = content
+        _blob_cache_size += len(content)
+    max_size = get_config().blob_cache_mb * 1024 * 1024
+    while _blob_cache and _blob_cache_size > max_size:
+        _, evicted = _blob_cache.popitem(last=False)
+        _blob_cache_size -= len(evicted)
+    return content
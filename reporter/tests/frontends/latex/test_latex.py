@@ -0,0 +1,40 @@
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from reporter.backends.snyk.model import SnykContainerScan
+from reporter.frontends.latex.latex import LatexDocument
+
+
+def test_lol() -> None:
+    assert True
+
+
+@pytest.fixture
+def scan() -> SnykContainerScan:
+    return SnykContainerScan.parse_file(
+        Path(__file__).parent / "../../_static/vulhub_php_5.4.1_cgi.json"
+    )
+
+
+def test_LatexDocument_plots_in_directory(scan: SnykContainerScan) -> None:
+    doc = LatexDocument(scan, [])
+    try:
+        doc.add_plot_severity_piechart()
+        # Plots are written to the document's own directory
+        assert doc.plots
+        for plot in doc.plots:
+            assert plot.parent == doc.directory
+    finally:
+        doc.delete_directory()
+    assert not doc.directory.exists()
+
+
+def test_LatexDocument_init_failed(scan: SnykContainerScan, tmp_path: Path) -> None:
+    with patch("tempfile.tempdir", str(tmp_path)):
+        with patch.object(LatexDocument, "_init_document", side_effect=ValueError):
+            with pytest.raises(ValueError):
+                LatexDocument(scan, [])
+    # The directory is removed if the document can't be created
+    assert list(tmp_path.iterdir()) == []
@@ -0,0 +1,28 @@
+from pathlib import Path
+
+import pytest
+
+from reporter._mock import get_mock_reportdata
+from reporter.backends.snyk.model import SnykContainerScan
+from reporter.frontends.shared.plots import scatter_mean_trend
+
+
+@pytest.fixture
+def scan() -> SnykContainerScan:
+    return SnykContainerScan.parse_file(
+        Path(__file__).parent / "../../_static/vulhub_php_5.4.1_cgi.json"
+    )
+
+
+def test_scatter_mean_trend(scan: SnykContainerScan, tmp_path: Path) -> None:
+    # Previous reports are `ReportData`, not `ScanType`
+    prev_reports = get_mock_reportdata(scan.image, n=5)
+    p = scatter_mean_trend(scan, prev_reports, directory=tmp_path)
+    assert p.path is not None and p.path.parent == tmp_path
+    assert p.path.exists()
+    assert "6 most recent reports" in p.description
+
+
+def test_scatter_mean_trend_no_prev_reports(scan: SnykContainerScan) -> None:
+    p = scatter_mean_trend(scan, [])
+    assert p.path is None
@@ -162,3 +162,12 @@ def test_statistics_table(report: ScanType) -> None:
     else:
         assert len(table.rows) == 1
     # TODO: add more tests to ensure the table data is correct
+
+
+def test_statistics_table_empty_aggregate() -> None:
+    """Aggregate reports without any reports should produce an empty table
+    with a full header, not fail on a missing first row."""
+    report = AggregateReport(reports=[])
+    table = statistics_table(report)
+    assert table.rows == []
+    assert len(table.header) == 10
@@ -22,6 +22,17 @@ def test_AggregateReport_from_file() -> None:
     assert len(list(ag.vulnerabilities)) == len(scan.vulnerabilities)
 
 
+def test_AggregateReport_most_common_cve() -> None:
+    scan = SnykContainerScan.parse_file(
+        Path(__file__).parent / "../_static/vulhub_php_5.4.1_cgi.json"
+    )
+    ag = AggregateReport(reports=[scan, scan])
+    # CVE counts are summed across all reports
+    expected = [(cve, n * 2) for cve, n in scan.most_common_cve(3)]
+    assert ag.most_common_cve(3) == expected
+    assert len(ag.most_common_cve(None)) == len(scan.most_common_cve(None))
+
+
 @given(CLASS_STRATEGIES[AggregateReport])
 @settings(max_examples=10, suppress_health_check=[HealthCheck.too_slow])
 def test_fuzz_AggregateReport(ag: AggregateReport) -> None:
@@ -136,3 +147,19 @@ def test_fuzz_AggregateReport(ag: AggregateReport) -> None:
 
     # Test len of get_exploitable() does not exceed total len
     assert len(list(ag.get_exploitable())) <= len(list(ag.vulnerabilities))
+
+
+def test_AggregateReport_distribution_by_severity_mutated() -> None:
+    scan = SnykContainerScan.parse_file(
+        Path(__file__).parent / "../_static/vulhub_php_5.4.1_cgi.json"
+    )
+    ag = AggregateReport(reports=[scan])
+    n_critical = ag.n_critical
+    assert ag.get_distribution_by_severity()["critical"] == n_critical
+
+    # Changing the severity of a vulnerability is reflected in the counts
+    vuln = next(v for v in scan.vulnerabilities if v.severity != "critical")
+    vuln.severity = "critical"
+    assert ag.n_critical == n_critical + 1
+    assert ag.get_distribution_by_severity()["critical"] == n_critical + 1
+    assert scan.get_distribution_by_severity()["critical"] == scan.n_critical
@@ -1,6 +1,6 @@
 # from typing import Any
 import math
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
 from typing import Any
 
@@ -30,6 +30,39 @@ def test_SnykContainerScan_from_file() -> None:
     assert math.isclose(scan.cvss_stdev, 1.6306600363641133)
 
 
+def test_SnykContainerScan_cvss() -> None:
+    scan = SnykContainerScan.parse_file(
+        Path(__file__).parent / "../_static/vulhub_php_5.4.1_cgi.json"
+    )
+    cvss = scan.cvss
+    assert math.isclose(cvss.mean, scan.cvss_mean)
+    assert math.isclose(cvss.median, scan.cvss_median)
+    assert math.isclose(cvss.stdev, scan.cvss_stdev)
+    assert cvss.max == scan.cvss_max
+    assert cvss.min == scan.cvss_min
+
+    # Metrics follow changes to the vulnerabilities
+    mean = scan.cvss_mean
+    scan.vulnerabilities[0].cvssScore = 11.0
+    assert scan.cvss.max == 11.0
+    assert 11.0 in scan.cvss_scores()
+    assert scan.cvss_mean > mean
+
+
+def test_SnykContainerScan_get_timestamp() -> None:
+    scan = SnykContainerScan.parse_file(
+        Path(__file__).parent / "../_static/vulhub_php_5.4.1_cgi.json"
+    )
+    # Naive timestamps are UTC
+    scan.image.created = datetime(2022, 5, 1, 12)
+    assert scan.get_timestamp() == datetime(2022, 5, 1, 12, tzinfo=timezone.utc)
+
+    # Timestamps with a different offset are not relabeled as UTC
+    tz = timezone(timedelta(hours=2))
+    scan.image.created = datetime(2022, 5, 1, 12, tzinfo=tz)
+    assert scan.get_timestamp() == datetime(2022, 5, 1, 10, tzinfo=timezone.utc)
+
+
 # Fuzzing test with hypothesis
 @settings(max_examples=10, suppress_health_check=[HealthCheck.too_slow])
 @given(CLASS_STRATEGIES[SnykContainerScan])
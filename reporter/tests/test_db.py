@@ -0,0 +1,119 @@
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+from auspex_core.models.scan import ReportData
+from google.api_core.exceptions import FailedPrecondition
+from google.cloud.firestore_v1 import DocumentSnapshot
+
+from reporter import db
+from reporter._mock import get_mock_reportdata
+
+CONFIG = SimpleNamespace(collection_reports="auspex-reports")
+
+
+@pytest.mark.anyio
+async def test_get_recent_reports_cached() -> None:
+    recent, old = get_mock_reportdata(n=2)
+    recent.id, recent.timestamp = "recent", datetime.utcnow()
+    old.id, old.timestamp = "old", datetime.utcnow() - timedelta(hours=1)
+    cache = {"recent": recent, "old": old}
+    with patch.object(db, "_recent_reports", cache):
+        reports = await db.get_recent_reports(
+            ["recent"], "auspex-reports", timedelta(minutes=1)
+        )
+    # Found in the cache without querying the database
+    assert reports == {"recent": recent}
+    # Expired reports are evicted
+    assert "old" not in cache
+
+
+@patch.object(db, "get_firestore_client", Mock())
+@patch.object(db, "get_config", Mock(return_value=CONFIG))
+@patch.object(db, "mark_reports_historical", AsyncMock())
+@patch.object(db, "_recent_reports", {})
+@pytest.mark.anyio
+async def test_log_report_in_background_grouped() -> None:
+    reports = get_mock_reportdata(n=3)
+    scans = [Mock() for _ in reports]
+    with patch.object(db, "get_reportdata", side_effect=reports):
+        with patch.object(db, "_log_reports", AsyncMock()) as log_reports:
+            for scan in scans:
+                db.log_report_in_background(scan)
+            await db.wait_for_background_tasks()
+    # Reports logged at the same time are written together
+    log_reports.assert_awaited_once()
+    assert log_reports.await_args.args[2] == list(zip(scans, reports))
+
+
+@patch.object(db, "get_firestore_client", Mock())
+@patch.object(db, "get_config", Mock(return_value=CONFIG))
+@patch.object(db, "mark_reports_historical", AsyncMock())
+@pytest.mark.anyio
+async def test_log_report_in_background_failed_not_cached() -> None:
+    (report,) = get_mock_reportdata(n=1)
+    cache = {}  # type: dict[str, ReportData]
+    with patch.object(db, "_recent_reports", cache):
+        with patch.object(db, "get_reportdata", return_value=report):
+            with patch.object(db, "_log_reports", AsyncMock(side_effect=Exception)):
+                db.log_report_in_background(Mock())
+                await db.wait_for_background_tasks()
+    # Reports that were not stored are not reused
+    assert cache == {}
+
+
+def _stream(*docs):
+    async def stream():
+        for doc in docs:
+            yield doc
+
+    return stream
+
+
+@pytest.mark.anyio
+async def test_get_prev_reports_fallback() -> None:
+    async def missing_index():
+        raise FailedPrecondition("The query requires an index.")
+        yield  # pragma: no cover
+
+    now = datetime.now(timezone.utc)
+    reports = get_mock_reportdata(n=3)
+    for i, r in enumerate(reports):
+        r.image.created = now - timedelta(days=i)
+    docs = [
+        DocumentSnapshot(Mock(id=r.id), r.dict(), True, None, None, None)
+        for r in reports
+    ]
+    # Reports are streamed in no particular order by the fallback query
+    query = Mock(stream=_stream(*docs[::-1]))
+    query.where.return_value.order_by.return_value.stream = missing_index
+
+    cutoff = now - timedelta(days=7)
+    prev = await db._get_prev_reports(query, cutoff, True, False, limit=2)
+    assert prev == reports[:2]
+
+
+@pytest.mark.anyio
+async def test_get_recent_report_docs() -> None:
+    cutoff = datetime.now(timezone.utc)
+    col = Mock()
+    query = col.where.return_value
+    query.where.return_value.get = AsyncMock(return_value=["recent"])
+    # Old reports are filtered out by the query
+    assert await db._get_recent_report_docs(col, ["a"], cutoff) == ["recent"]
+    query.where.assert_called_with("timestamp", ">", cutoff)
+
+    # Falls back on querying by ID only if the index is missing
+    query.where.return_value.get.side_effect = FailedPrecondition("index")
+    query.get = AsyncMock(return_value=["recent", "old"])
+    assert await db._get_recent_report_docs(col, ["a"], cutoff) == ["recent", "old"]
+
+
+def test_get_prev_scans_query_not_cached() -> None:
+    clients = [Mock(), Mock()]
+    with patch.object(db, "get_firestore_client", side_effect=clients):
+        # Each query is built with the current client
+        for client in clients:
+            query = db._get_prev_scans_query("auspex-reports", False)
+            assert query is client.collection.return_value.select.return_value
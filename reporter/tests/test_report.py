@@ -0,0 +1,61 @@
+import asyncio
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from typing import Optional
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+from auspex_core.docker.models import ImageInfo
+from auspex_core.models.scan import ScanLog
+
+from reporter import report
+from reporter.report import _dedupe_scans
+
+
+def _scanlog(id: str, digest: Optional[str], age: timedelta) -> ScanLog:
+    return ScanLog(
+        id=id,
+        image=ImageInfo(
+            imageSizeBytes="123",
+            layerId="",
+            mediaType="application/vnd.docker.image.rootfs.diff.tar.gzip",
+            tag=["latest"],
+            timeCreatedMs=datetime(2022, 1, 1),
+            timeUploadedMs=datetime(2022, 1, 1),
+            digest=digest,
+            image="ubuntu",
+        ),
+        backend="snyk",
+        timestamp=datetime(2022, 6, 1) - age,
+        url="",
+        blob="",
+        bucket="",
+    )
+
+
+def test_dedupe_scans() -> None:
+    scans = {
+        "old": _scanlog("old", "sha256:1", timedelta(days=1)),
+        "new": _scanlog("new", "sha256:1", timedelta(days=0)),
+        "other": _scanlog("other", "sha256:2", timedelta(days=2)),
+        "nodigest1": _scanlog("nodigest1", None, timedelta(days=1)),
+        "nodigest2": _scanlog("nodigest2", None, timedelta(days=0)),
+    }
+    # Only the newest scan of each image is kept.
+    # Scans without a digest can't be compared, and are kept.
+    assert list(_dedupe_scans(scans)) == ["new", "other", "nodigest1", "nodigest2"]
+
+
+@patch.object(report, "get_config", Mock(return_value=SimpleNamespace(cache_ttl=60)))
+@patch.object(report, "_scan_logs", {})
+@pytest.mark.anyio
+async def test_fetch_scan_cached() -> None:
+    scan = _scanlog("scan", "sha256:1", timedelta(days=0))
+    with patch.object(report, "_fetch_scan", AsyncMock(return_value=scan)) as fetch:
+        # Concurrent requests for the same scan share a single fetch
+        assert await asyncio.gather(
+            report.fetch_scan("scan"), report.fetch_scan("scan")
+        ) == [scan, scan]
+        # Subsequent requests are served from the cache
+        assert await report.fetch_scan("scan") is scan
+    fetch.assert_awaited_once_with("scan")
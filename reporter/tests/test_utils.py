@@ -1,6 +1,14 @@
 import math
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
+import numpy as np
+import pytest
 
 from reporter.utils import npmath
+from reporter.utils import storage
+from reporter.utils.http import close_http_client, get_http_client
+from reporter.utils.matplotlib import get_cvss_color, get_cvss_colors
 
 
 def test_mean() -> None:
@@ -8,6 +16,7 @@ def test_mean() -> None:
     assert math.isclose(npmath.mean([1, 2, 3, 4, 5]), 3.0)
     assert math.isclose(npmath.mean([]), 0.0)
     assert math.isclose(npmath.mean([1, "2", 3]), 0.0)
+    assert math.isclose(npmath.mean(x for x in [1, 2, 3, 4, 5]), 3.0)
 
 
 def test_median() -> None:
@@ -22,3 +31,40 @@ def test_stdev() -> None:
     assert math.isclose(npmath.stdev([1, 2, 3, 4, 5]), 1.4142135623730951)
     assert math.isclose(npmath.stdev([]), 0.0)
     assert math.isclose(npmath.stdev([1, "2", 3]), 0.0)
+
+
+def test_get_cvss_colors() -> None:
+    scores = [0.0, 0.1, 3.9, 5.0, 7.5, 10.0]
+    colors = get_cvss_colors(scores)
+    assert colors.shape == (len(scores), 4)
+    for score, color in zip(scores, colors):
+        assert np.array_equal(color, get_cvss_color(score))
+
+
+@pytest.mark.anyio
+async def test_get_http_client_shared() -> None:
+    client = get_http_client()
+    assert get_http_client() is client
+
+    await close_http_client()
+    assert client.is_closed
+    assert get_http_client() is not client
+    await close_http_client()
+
+
+@pytest.mark.anyio
+async def test_fetch_scan_blob_cache() -> None:
+    blob = b"x" * 400 * 1024  # 3 blobs exceed the 1 MB cache
+    download = AsyncMock(return_value=blob)
+    config = SimpleNamespace(blob_cache_mb=1)
+    with patch.object(storage, "download_blob", download), patch.object(
+        storage, "get_config", return_value=config
+    ), patch.object(storage, "_blob_cache", type(storage._blob_cache)()), patch.object(
+        storage, "_blob_cache_size", 0
+    ):
+        for name in ["a", "b", "a", "c", "a", "b"]:
+            assert await storage.fetch_scan_blob("bucket", name) == blob
+        # "a" is a cache hit every time it's used again, and "b" is evicted
+        # when "c" is added, since "a" was used more recently
+        assert [c.args[1] for c in download.await_args_list] == ["a", "b", "c", "b"]
+        assert storage._blob_cache_size <= 1024 * 1024
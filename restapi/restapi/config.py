@@ -1,3 +1,4 @@
+from functools import cache
 from typing import Optional
 
 from pydantic import BaseSettings, Field
@@ -8,3 +9,12 @@ class AppConfig(BaseSettings):
     url_scanner: str = Field(..., env="URL_SCANNER")
     timeout_reporter: Optional[float] = Field(600, env="TIMEOUT_REPORTER")
     timeout_scanner: Optional[float] = Field(600, env="TIMEOUT_SCANNER")
+
+
+@cache
+def get_config() -> AppConfig:
+    """Returns the application config.
+
+    The config is only parsed from the environment on the first call.
+    Subsequent calls return the cached config."""
+    return AppConfig()
@@ -1,7 +1,7 @@
 from fastapi import FastAPI
 from loguru import logger
 
-from .config import AppConfig
+from .config import get_config
 from .exceptions import install_handlers
 from .routes import reports_router, scans_router, status_router
 
@@ -22,4 +22,4 @@ app.include_router(status_router)
 async def startup():
     logger.info("Starting up")
     # Instantiate config to check for missing fields
-    AppConfig()
+    get_config()
@@ -16,7 +16,7 @@ from fastapi.exceptions import HTTPException
 from httpx import RequestError, Response
 from loguru import logger
 
-from ..config import AppConfig
+from ..config import get_config
 from ..models import ScanReportRequest
 from .scans import do_request_scans
 
@@ -39,9 +39,9 @@ async def _create_reports(scans: list[ScanLog], req: ScanReportRequest) -> Repor
         scan_ids=[scan.id for scan in scans],
         **req.dict(),
     )
-    async with httpx.AsyncClient(timeout=AppConfig().timeout_reporter) as client:
+    async with httpx.AsyncClient(timeout=get_config().timeout_reporter) as client:
         res = await client.post(
-            f"{AppConfig().url_reporter}/reports", json=request.dict()
+            f"{get_config().url_reporter}/reports", json=request.dict()
         )
         if res.status_code != 200:
             raise HTTPException(status_code=res.status_code, detail=res.text)
@@ -74,9 +74,9 @@ async def get_reports(
 )
 async def _get_reports(request: Request, params: ReportQuery = Depends()) -> Response:
     """Retrieves reports for the given query parameters from the Reporter service."""
-    async with httpx.AsyncClient(timeout=AppConfig().timeout_reporter) as client:
+    async with httpx.AsyncClient(timeout=get_config().timeout_reporter) as client:
         res = await client.get(
-            f"{AppConfig().url_reporter}/reports",
+            f"{get_config().url_reporter}/reports",
             params=request.query_params,
         )
         res.raise_for_status()  # Is this a bad idea
@@ -100,5 +100,5 @@ async def get_report(report_id: str) -> ReportData:
 async def _get_report(report_id: str) -> Response:
     """Fetches a report from the reporter service."""
     async with httpx.AsyncClient(timeout=30) as client:
-        res = await client.get(f"{AppConfig().url_reporter}/reports/{report_id}")
+        res = await client.get(f"{get_config().url_reporter}/reports/{report_id}")
         return res
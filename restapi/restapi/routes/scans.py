@@ -11,7 +11,7 @@ from fastapi import APIRouter
 from fastapi.exceptions import HTTPException
 from loguru import logger
 
-from ..config import AppConfig
+from ..config import get_config
 
 router = APIRouter(prefix="/scans", tags=["scans"])
 
@@ -19,8 +19,8 @@ router = APIRouter(prefix="/scans", tags=["scans"])
 @router.get("/{scan_id}", response_model=ScanLog)
 async def get_scan(scan_id: str) -> ScanLog:
     """Get a scan by its ID."""
-    async with httpx.AsyncClient(timeout=AppConfig().timeout_scanner) as client:
-        res = await client.get(f"{AppConfig().url_scanner}/{scan_id}")
+    async with httpx.AsyncClient(timeout=get_config().timeout_scanner) as client:
+        res = await client.get(f"{get_config().url_scanner}/{scan_id}")
     res.raise_for_status()
     try:
         return res.json()
@@ -59,8 +59,8 @@ async def do_request_scans(req: ScanRequest) -> list[ScanLog]:
     `list[ScanLog]`
         The parsed scans.
     """
-    async with httpx.AsyncClient(timeout=AppConfig().timeout_scanner) as client:
-        res = await client.post(f"{AppConfig().url_scanner}/scans", json=req.dict())
+    async with httpx.AsyncClient(timeout=get_config().timeout_scanner) as client:
+        res = await client.post(f"{get_config().url_scanner}/scans", json=req.dict())
     res.raise_for_status()  # can we do this?
     try:
         j = res.json()
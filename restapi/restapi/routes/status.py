@@ -1,3 +1,4 @@
+import asyncio
 from functools import partial
 from typing import Optional
 
@@ -12,7 +13,7 @@ from auspex_core.utils.backoff import on_backoff, on_giveup
 from fastapi import APIRouter
 from loguru import logger
 
-from ..config import AppConfig
+from ..config import get_config
 
 router = APIRouter(prefix="/status", tags=["status"])
 
@@ -21,12 +22,16 @@ router = APIRouter(prefix="/status", tags=["status"])
 async def get_status() -> ServiceStatusAggregate:
     """Retrieves the status of all services."""
     services = {
-        "scanner": AppConfig().url_scanner,
-        "reporter": AppConfig().url_reporter,
+        "scanner": get_config().url_scanner,
+        "reporter": get_config().url_reporter,
         # BACKLOG: can we populate this dict automatically?
     }
-    # TODO: use asyncio.gather to perform requests in parallel
-    responses = {name: await get_service_status(url) for name, url in services.items()}
+    # Perform requests in parallel. get_service_status() never raises,
+    # so we don't need return_exceptions=True here.
+    statuses = await asyncio.gather(
+        *[get_service_status(url) for url in services.values()]
+    )
+    responses = dict(zip(services, statuses))
     return responses
 
 
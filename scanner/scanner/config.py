@@ -1,3 +1,4 @@
+from functools import cache
 from typing import Optional
 
 from pydantic import BaseSettings, Field
@@ -8,3 +9,12 @@ class AppConfig(BaseSettings):
     collection_scans: str = Field(..., env="COLLECTION_SCANS")
     bucket_scans: str = Field(..., env="BUCKET_SCANS")
     timeout_scanner: Optional[float] = Field(600, env="TIMEOUT_SCANNER")
+
+
+@cache
+def get_config() -> AppConfig:
+    """Returns the application config.
+
+    The config is only parsed from the environment on the first call.
+    Subsequent calls return the cached config."""
+    return AppConfig()
@@ -9,7 +9,7 @@ from auspex_core.models.api.scan import ScanRequest, ScanResults
 from auspex_core.models.scan import ScanLog
 from google.api_core.exceptions import ServerError
 
-from .config import AppConfig
+from .config import get_config
 
 
 @backoff.on_exception(
@@ -25,7 +25,7 @@ async def log_scan(scan: ScanResults, options: ScanRequest) -> ScanLog:
 
     # Upload JSON log blob to bucket
     obj = await upload_json_blob_from_memory(
-        scan.scan, filename, AppConfig().bucket_scans
+        scan.scan, filename, get_config().bucket_scans
     )
 
     scanlog = ScanLog(
@@ -40,7 +40,9 @@ async def log_scan(scan: ScanResults, options: ScanRequest) -> ScanLog:
     )
 
     # Add firestore document
-    doc = await add_document(AppConfig().collection_scans, scanlog.dict(exclude={"id"}))
+    doc = await add_document(
+        get_config().collection_scans, scanlog.dict(exclude={"id"})
+    )
 
     scanlog.id = doc.id
 
@@ -1,16 +1,16 @@
 from auspex_core.gcp.firestore import check_db_exists
 from loguru import logger
 
-from .config import AppConfig
+from .config import get_config
 
 
 async def startup_health_check() -> None:
     """Checks that the application is ready to run."""
     # Check that config works
-    AppConfig()
+    get_config()
 
     # check that the firestore database exists and we can connect to it
-    if not await check_db_exists(AppConfig().collection_scans):
+    if not await check_db_exists(get_config().collection_scans):
         logger.error("Unable to contact Firestore database. Exiting...")
         exit(1)
 
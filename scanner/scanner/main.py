@@ -5,7 +5,9 @@ from json import JSONDecodeError
 import backoff
 import httpx
 from auspex_core.docker.registry import get_image_info, get_repos_in_registry
+from auspex_core.exceptions import DocumentNotFound
 from auspex_core.gcp.firestore import check_db_exists, get_document
+from auspex_core.gcp.storage import close_storage_clients
 from auspex_core.models.api.scan import ScanRequest, ScanResults
 from auspex_core.models.scan import ScanLog
 from auspex_core.models.status import ServiceStatus, ServiceStatusCode
@@ -15,7 +17,7 @@ from fastapi.exceptions import HTTPException
 from fastapi.responses import PlainTextResponse
 from loguru import logger
 
-from .config import AppConfig
+from .config import get_config
 from .db import log_scan
 from .exceptions import UnknownBackend, install_handlers
 from .health import startup_health_check
@@ -23,7 +25,7 @@ from .health import startup_health_check
 app = FastAPI()
 install_handlers(app)
 
-BACKENDS = {"snyk": AppConfig().url_scanner_snyk}
+BACKENDS = {"snyk": get_config().url_scanner_snyk}
 # clair?
 
 
@@ -32,6 +34,11 @@ async def on_app_startup():
     await startup_health_check()
 
 
+@app.on_event("shutdown")
+async def on_app_shutdown():
+    await close_storage_clients()
+
+
 @app.post("/scans", response_model=list[ScanLog])
 async def scan_images(req: ScanRequest) -> list[ScanLog]:
     """Scan one or more images."""
@@ -59,7 +66,7 @@ async def do_request_scans(req: ScanRequest) -> list[ScanLog]:
     # Instantiate async client
     # (`async with AsyncClient(...)` is inconsistent when combined with asyncio.gather)
     # Sometimes it closes the client while some requests are still pending
-    client = httpx.AsyncClient(timeout=AppConfig().timeout_scanner)
+    client = httpx.AsyncClient(timeout=get_config().timeout_scanner)
 
     if req.repository:
         images = await get_repos_in_registry(req.repository, req.excluded_images)
@@ -139,8 +146,10 @@ async def _check_responses(
     responses: list[httpx.Response], ignore_failed: bool
 ) -> tuple[list[httpx.Response], list[httpx.Response]]:
     """Sorts out failed or malformed responses and returns the rest."""
-    failed = [res for res in responses if res.is_error]
-    ok = [res for res in responses if not res.is_error]
+    ok = []  # type: list[httpx.Response]
+    failed = []  # type: list[httpx.Response]
+    for res in responses:
+        (failed if res.is_error else ok).append(res)
     await _handle_failed(failed, ignore_failed)
     return ok, failed
 
@@ -229,8 +238,8 @@ async def get_scan(scan_id: str) -> ScanLog:
         The scan log for the given scan ID.
     """
     try:
-        doc = await get_document(AppConfig().collection_scans, scan_id)
-    except ValueError:
+        doc = await get_document(get_config().collection_scans, scan_id)
+    except DocumentNotFound:
         raise HTTPException(status_code=404, detail="Scan not found")
     return ScanLog(**doc.to_dict(), id=doc.id)
 
@@ -238,7 +247,7 @@ async def get_scan(scan_id: str) -> ScanLog:
 @app.head("/scans")
 async def get_scans_head() -> PlainTextResponse:
     """HEAD request handler that checks if database is reachable."""
-    if await check_db_exists(AppConfig().collection_scans):
+    if await check_db_exists(get_config().collection_scans):
         return PlainTextResponse(status_code=200)
     else:
         raise HTTPException(status_code=500, detail="Database unreachable")
@@ -248,7 +257,7 @@ async def get_scans_head() -> PlainTextResponse:
 async def get_service_status(request: Request) -> ServiceStatus:
     """Get the status of the server."""
     # TODO: add more backends. We just return the status of the Snyk scanner now.
-    return await _get_scanner_status(request, AppConfig().url_scanner_snyk, "Snyk")
+    return await _get_scanner_status(request, get_config().url_scanner_snyk, "Snyk")
 
 
 async def _get_scanner_status(request: Request, url: str, name: str) -> ServiceStatus:
@@ -11,11 +11,11 @@ from fastapi.exceptions import HTTPException
 from google.cloud.firestore_v1 import DocumentSnapshot
 from loguru import logger
 
-from .config import AppConfig
+from .config import get_config
 
 
 async def get_object_from_document(
-    doc: DocumentSnapshot, bucket: str = AppConfig().bucket_scans
+    doc: DocumentSnapshot, bucket: str = get_config().bucket_scans
 ) -> StorageObject:
     """Wrapper around `auspex_core.gcp.storage.fetch_json_blob`
     that handles exceptions and logging for the service.
@@ -1,3 +1,4 @@
+from functools import cache
 from typing import Optional
 
 from pydantic import BaseSettings, Field
@@ -6,3 +7,12 @@ from pydantic import BaseSettings, Field
 class AppConfig(BaseSettings):
     project: str = Field(..., env="GOOGLE_CLOUD_PROJECT")
     google_credentials: str = Field(..., env="GOOGLE_APPLICATION_CREDENTIALS")
+
+
+@cache
+def get_config() -> AppConfig:
+    """Returns the application config.
+
+    The config is only parsed from the environment on the first call.
+    Subsequent calls return the cached config."""
+    return AppConfig()
@@ -1,17 +1,17 @@
 from auspex_core.gcp.firestore import check_db_exists
 from loguru import logger
 
-from .config import AppConfig
+from .config import get_config
 
 
 async def startup_health_check() -> None:
     """Checks that the application is ready to run."""
     # Check that config works
-    AppConfig()
+    get_config()
 
     # Check credentials
-    check_credentials_json(AppConfig().google_credentials)
-    check_credentials_usable(AppConfig().google_credentials)
+    check_credentials_json(get_config().google_credentials)
+    check_credentials_usable(get_config().google_credentials)
 
 
 def check_credentials_json(credentials_file: str) -> None:
@@ -12,7 +12,7 @@ from fastapi.responses import PlainTextResponse
 from loguru import logger
 from pydantic import BaseModel
 
-from .config import AppConfig
+from .config import get_config
 from .exceptions import install_handlers
 from .health import startup_health_check
 from .models import ScanOptions
@@ -32,7 +32,7 @@ async def scan_image(options: ScanOptions) -> ScanResults:
     """Scans a single container image."""
     assert options.image, "No image specified"  # TODO: make this a HTTP error
 
-    image_info = await get_image_info(options.image, AppConfig().project)
+    image_info = await get_image_info(options.image, get_config().project)
     logger.debug(image_info)
     # TODO: pass ImageInfo object to scan_container
     #       Only use credentials if scanning image from private repo
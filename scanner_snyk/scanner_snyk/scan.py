@@ -12,7 +12,7 @@ from auspex_core.utils.backoff import on_backoff, on_giveup
 from loguru import logger
 from pydantic import BaseModel, Field
 
-from .config import AppConfig
+from .config import get_config
 from .models import ScanOptions
 
 DEFAULT_CMD = "snyk"
@@ -137,7 +137,7 @@ def get_snyk_cmd(image: ImageInfo, options: ScanOptions) -> str:
     # TODO: decide authentication scheme based on image info + configured repos
     # TODO: replace with something more robust:
     if "gcr.io" in image.image:
-        cmd += f'--username=_json_key --password="$(cat {AppConfig().google_credentials})" '
+        cmd += f'--username=_json_key --password="$(cat {get_config().google_credentials})" '
     if not options.base_vulns:
         cmd += "--exclude-base-image-vulns "
     # if options.app_vulns:
@@ -97,6 +97,33 @@ def get_indexes() -> list[list[Index.IndexField]]:
             ]
         )
 
+    # Image + Image creation time indexes
+    for order in [ASC, DESC]:
+        indexes.append(
+            [
+                IF(field_path="image.image", order=ASC),
+                IF(field_path="image.created", order=order),
+            ]
+        )
+
+    # Aggregate + Timestamp/Image creation time indexes
+    for field in ["timestamp", "image.created"]:
+        for order in [ASC, DESC]:
+            indexes.append(
+                [
+                    IF(field_path="aggregate", order=ASC),
+                    IF(field_path=field, order=order),
+                ]
+            )
+
+    # ID + Timestamp index
+    indexes.append(
+        [
+            IF(field_path="id", order=ASC),
+            IF(field_path="timestamp", order=ASC),
+        ]
+    )
+
     # Image + Historical indexes
     indexes.append(
         [